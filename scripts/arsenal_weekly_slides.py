@@ -5,13 +5,16 @@ Arsenal FC data and generate a self-contained Stadium Lights HTML slide deck.
 
 Outputs:
   - docs/arsenal-weekly.html  (committed + pushed to GitHub Pages)
+  - docs/assets/arsenal-nav.<hash>.js  (shared nav script, see assets.py)
 """
 
 import anthropic
 import os
 import re
 import sys
-import time
+
+import assets
+import rate_limit
 
 REPO_DIR   = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 PAGES_FILE = os.path.join(REPO_DIR, "docs", "arsenal-weekly.html")
@@ -324,8 +327,10 @@ def generate_slides() -> str:
         iteration += 1
         print(f"  API call #{iteration} (stop_reason pending)…")
 
-        # Retry up to 5 times on rate limit errors with exponential backoff
+        # Every call takes a token from the shared Anthropic bucket (rate_limit.py);
+        # on a 429 the bucket is paused for the server's Retry-After, up to 5 tries
         for attempt in range(5):
+            rate_limit.acquire("anthropic")
             try:
                 response = client.messages.create(
                     model="claude-sonnet-4-6",
@@ -335,12 +340,14 @@ def generate_slides() -> str:
                 )
                 break
             except anthropic.RateLimitError as e:
-                wait = 60 * (2 ** attempt)  # 60s, 120s, 240s, 480s, 960s
-                print(f"  Rate limit hit (attempt {attempt+1}/5) — waiting {wait}s…")
-                time.sleep(wait)
                 if attempt == 4:
                     print("  Rate limit retry exhausted.", file=sys.stderr)
                     raise
+                wait = rate_limit.parse_retry_after(e.response.headers.get("retry-after"))
+                if wait is None:
+                    wait = 15 * (2 ** attempt)  # 15s, 30s, 60s, 120s
+                print(f"  Rate limit hit (attempt {attempt+1}/5) — pausing {wait:.0f}s…")
+                rate_limit.penalize("anthropic", wait)
 
         print(f"  stop_reason={response.stop_reason}")
 
@@ -470,8 +477,8 @@ def extract_html(raw: str) -> str:
 
 # ── Post-generation validation & auto-fix ──────────────────────────────────────
 
+# Served as assets/arsenal-nav.<hash>.js so it is cached across weeks
 NAV_JS = """\
-<script>
 (function () {
   var slides = Array.from(document.querySelectorAll('section.slide'));
   var dots   = Array.from(document.querySelectorAll('#navDots .nav-dot'));
@@ -487,7 +494,7 @@ NAV_JS = """\
     if (e.key === 'ArrowUp'   || e.key === 'ArrowLeft')  goTo(Math.max(cur - 1, 0));
   });
 })();
-</script>"""
+"""
 
 SLIDE7_FALLBACK = """\
 <section class="slide" id="slide-6">
@@ -537,6 +544,11 @@ HOT_TAKE_FALLBACK = """\
     </div>"""
 
 
+def _normalise_js(js: str) -> str:
+    """Script text with all whitespace removed, for comparing against NAV_JS."""
+    return re.sub(r"\s+", "", js)
+
+
 def validate_and_fix(html: str) -> str:
     """
     Post-generation checks and auto-fixes for recurring issues.
@@ -592,10 +604,16 @@ def validate_and_fix(html: str) -> str:
                 html = html[:insert_pos] + HOT_TAKE_FALLBACK + "\n" + html[insert_pos:]
                 fixes.append("Injected missing hot-take section into slide 7")
 
-    # ── 5. Nav JS: ensure IntersectionObserver block is present ─────────────
+    # ── 5. Nav JS: swap the inline block for the shared NAV_JS asset ────────
+    # Only a block that is NAV_JS itself (whitespace aside) is removed; any
+    # other script — including a nav script the model wrote its own way — stays.
+    for block, body in re.findall(r'(<script(?![^>]*\bsrc=)[^>]*>([\s\S]*?)</script>)', html, re.IGNORECASE):
+        if _normalise_js(body) == _normalise_js(NAV_JS):
+            html = re.sub(r"\s*" + re.escape(block), "", html, count=1)
+            fixes.append("Removed inline nav JS block (served as the shared asset)")
     if "IntersectionObserver" not in html:
-        html = html.replace("</body>", NAV_JS + "\n</body>")
-        fixes.append("Injected missing nav JS (IntersectionObserver)")
+        html = html.replace("</body>", assets.script_tag(assets.href("arsenal-nav", "js", NAV_JS)) + "\n</body>")
+        fixes.append("Injected shared nav JS asset (assets/arsenal-nav.*.js)")
 
     # ── 6. Slide structure: remove junk appended after last </section> ───────
     # Anything between the last </section> and </body> that is NOT a <script> block
@@ -719,6 +737,7 @@ def main():
     html = validate_and_fix(html)
 
     os.makedirs(os.path.dirname(PAGES_FILE), exist_ok=True)
+    assets.publish("arsenal-nav", "js", NAV_JS, os.path.dirname(PAGES_FILE))
 
     with open(PAGES_FILE, "w", encoding="utf-8") as f:
         f.write(html)
@@ -0,0 +1,54 @@
+"""
+Static Assets
+Content-hashed CSS / JS shared by the published pages. Each asset is written
+as assets/<name>.<hash>.<ext> beside the pages that use it; the name changes
+whenever the content does, so browsers can cache a file forever and reuse it
+across pages and across weeks — a weekly page only carries its own data.
+
+Old versions are never deleted: archived weeks keep pointing at the bundle
+they were built with.
+"""
+
+import os
+import hashlib
+
+ASSETS_DIRNAME = "assets"
+HASH_LEN       = 10
+
+
+def hashed_name(name, ext, content):
+    """`name.<hash>.ext` for `content` (str)."""
+    digest = hashlib.sha256(content.encode("utf-8")).hexdigest()[:HASH_LEN]
+    return f"{name}.{digest}.{ext}"
+
+
+def href(name, ext, content):
+    """Link to `content` from a page sitting next to the assets directory."""
+    return f"{ASSETS_DIRNAME}/{hashed_name(name, ext, content)}"
+
+
+def publish(name, ext, content, *page_dirs):
+    """
+    Write `content` to <page_dir>/assets/<hashed name> for each page_dir
+    (skipped if it is already there) and return the href to use from a
+    page in any of those directories.
+    """
+    filename = hashed_name(name, ext, content)
+    for page_dir in page_dirs:
+        path = os.path.join(page_dir, ASSETS_DIRNAME, filename)
+        if os.path.exists(path):
+            continue
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp = path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            f.write(content)
+        os.replace(tmp, path)
+    return href(name, ext, content)
+
+
+def stylesheet_tag(url):
+    return f'<link rel="stylesheet" href="{url}">'
+
+
+def script_tag(url):
+    return f'<script src="{url}"></script>'
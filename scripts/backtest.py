@@ -0,0 +1,174 @@
+"""
+Forecast Back-test
+Scores every matured 1W / 1M forecast range in the digest archive against
+the price on the day its horizon ended, in one vectorised pass over the
+column store (digest_store.py) and the local price history (price_store.py).
+
+Per horizon:
+  n            band forecasts whose horizon has passed and whose end price is
+               known (single-price targets have no band to score and are skipped)
+  hit_rate     share where that price landed inside [low, high]
+  miss_pct     median distance outside the band for the misses, % of price
+  width_pct    median band width, % of the band's midpoint
+  bias_pct     mean (realised − midpoint) / midpoint; above 0 = forecasts ran low
+  calibration  share of realised prices below the band, in its lower half,
+               in its upper half and above it — a well-set band keeps most
+               in the middle two, split about evenly
+
+Realised prices come from the price store, falling back to the prices the
+digests themselves recorded for days the store does not cover.
+
+Usage:
+  python scripts/backtest.py                    # score the local archive
+  python scripts/backtest.py --synthetic 50000  # time N random forecasts
+"""
+
+import os
+import time
+import argparse
+import datetime
+
+import numpy as np
+
+import digest_store
+import price_store
+
+DIGEST_DIR = os.path.expanduser("~/Documents/BitCoinNewsDaily")
+
+HORIZONS = {"1w": 7, "1m": 30}
+CALIBRATION_BUCKETS = ("below", "lower_half", "upper_half", "above")
+
+
+# ── 1. Scoring ────────────────────────────────────────────────────────────────
+
+def _day_numbers(dates):
+    return np.asarray(dates, dtype="datetime64[D]").astype(np.int64)
+
+
+def price_series(price_dates, prices, digest_dates=None, digest_prices=None):
+    """
+    (sorted day numbers, prices) merging the price store with the digests'
+    recorded prices; the store wins on days both have.
+    """
+    days = [_day_numbers(price_dates)]
+    vals = [np.asarray(prices, dtype=np.float64)]
+    if digest_dates is not None:
+        days.append(_day_numbers(digest_dates))
+        vals.append(np.asarray(digest_prices, dtype=np.float64))
+    days, vals = np.concatenate(days), np.concatenate(vals)
+    known = ~np.isnan(vals)
+    days, first = np.unique(days[known], return_index=True)
+    return days, vals[known][first]
+
+
+def realised(targets, price_days, prices):
+    """Price on each target day number, NaN where the series has none."""
+    if not len(price_days):
+        return np.full(len(targets), np.nan)
+    idx   = np.searchsorted(price_days, targets)
+    safe  = np.minimum(idx, len(price_days) - 1)
+    found = (idx < len(price_days)) & (price_days[safe] == targets)
+    return np.where(found, prices[safe], np.nan)
+
+
+def score(dates, lows, highs, price_days, prices, horizon_days, kinds=None):
+    """Summary dict for one horizon's forecasts (see module docstring)."""
+    lows, highs = np.asarray(lows, dtype=np.float64), np.asarray(highs, dtype=np.float64)
+    actual = realised(_day_numbers(dates) + horizon_days, price_days, prices)
+    ok = ~(np.isnan(lows) | np.isnan(highs) | np.isnan(actual)) & (highs >= lows)
+    if kinds is not None:
+        ok &= np.asarray(kinds) != "single"
+    lows, highs, actual = lows[ok], highs[ok], actual[ok]
+    n = int(len(actual))
+    if not n:
+        return {"n": 0}
+
+    mid   = (lows + highs) / 2
+    width = highs - lows
+    hit   = (actual >= lows) & (actual <= highs)
+    miss  = np.where(actual < lows, lows - actual, actual - highs) / actual
+    # 0 = low edge, 1 = high edge; zero-width bands land by side only
+    pos = np.divide(actual - lows, width, where=width > 0,
+                    out=np.where(actual < lows, -1.0, np.where(actual > highs, 2.0, 0.5)))
+    buckets = np.bincount((pos >= 0).astype(int) + (pos >= 0.5) + (pos > 1), minlength=4)
+    return {
+        "n":           n,
+        "hit_rate":    float(hit.mean()),
+        "miss_pct":    float(np.median(miss[~hit]) * 100) if (~hit).any() else 0.0,
+        "width_pct":   float(np.median(width / mid) * 100),
+        "bias_pct":    float(np.mean((actual - mid) / mid) * 100),
+        "calibration": dict(zip(CALIBRATION_BUCKETS, (buckets / n).round(4).tolist())),
+    }
+
+
+def backtest(columns, price_dates, prices, horizons=HORIZONS):
+    """{horizon: summary} for digest_store columns against a daily price series."""
+    days, vals = price_series(price_dates, prices, columns["date"], columns["actual_price"])
+    return {h: score(columns["date"], columns[f"{h}_low"], columns[f"{h}_high"], days, vals, d,
+                     columns.get(f"{h}_kind"))
+            for h, d in horizons.items()}
+
+
+def from_store(digest_dir, asset="bitcoin", currency="usd"):
+    """
+    Back-test the whole column store in `digest_dir` against the price
+    history already on disk there (no network). Empty dict if no digests.
+    """
+    columns = digest_store.DigestStore(digest_dir).columns()
+    if not len(columns["date"]):
+        return {}
+    first = digest_store.to_dates(columns["date"][:1])[0]
+    with price_store.PriceStore(digest_dir, asset, currency) as store:
+        rows = store.window((datetime.date.today() - first).days + max(HORIZONS.values()))
+    return backtest(columns, [d for d, _ in rows], [p for _, p in rows])
+
+
+# ── 2. CLI ────────────────────────────────────────────────────────────────────
+
+def _synthetic(n, seed=0):
+    """`n` daily forecasts over random-walk prices, as (columns, price_dates, prices)."""
+    rng    = np.random.default_rng(seed)
+    dates  = np.datetime64("2000-01-01") + np.arange(n + 31)
+    prices = 60000 * np.exp(np.cumsum(rng.normal(0, 0.03, len(dates))))
+    cols   = {"date": dates[:n], "actual_price": prices[:n]}
+    for h, d in HORIZONS.items():
+        spread = prices[:n] * rng.uniform(0.02, 0.15, n) * np.sqrt(d / 7)
+        centre = prices[:n] * (1 + rng.normal(0, 0.02, n))
+        cols[f"{h}_low"], cols[f"{h}_high"] = centre - spread, centre + spread
+    return cols, dates, prices
+
+
+def print_summary(results):
+    for h, r in results.items():
+        if not r.get("n"):
+            print(f"   {h}: no matured forecasts yet")
+            continue
+        cal = "  ".join(f"{k} {v:.0%}" for k, v in r["calibration"].items())
+        print(f"   {h}: {r['hit_rate']:.0%} hit over {r['n']:,} · width {r['width_pct']:.1f}% · "
+              f"bias {r['bias_pct']:+.1f}% · median miss {r['miss_pct']:.1f}%")
+        print(f"       calibration: {cal}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Back-test the digests' forecast ranges")
+    parser.add_argument("--synthetic", type=int, metavar="N",
+                        help="score N random forecasts instead of the archive and report the time")
+    args = parser.parse_args()
+
+    if args.synthetic:
+        cols, price_dates, prices = _synthetic(args.synthetic)
+        t0 = time.perf_counter()
+        results = backtest(cols, price_dates, prices)
+        dt = time.perf_counter() - t0
+        print(f"⏱  Scored {args.synthetic * len(HORIZONS):,} forecasts in {dt * 1e3:.1f} ms")
+    else:
+        print(f"📊 Back-testing forecasts in {DIGEST_DIR}...")
+        results = from_store(DIGEST_DIR)
+        if not results:
+            print("❌ Column store is empty — run bitcoin_chart.py first to fill it.")
+            return
+    print_summary(results)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,353 @@
+"""
+Chart Build Benchmark
+Measures bitcoin_chart.build_chart and the page writers on synthetic
+archives (digests plus a price series covering the same days) and saves the
+results as JSON so runs can be compared across commits.
+
+Reports, per archive size (days):
+  - figure build time, fast dict path and validated go.Figure path
+  - serialisation time of the default split page (chart_html.write_split)
+  - trace, shape and annotation counts
+  - output bytes: split shell + chunks, single compact page, plotly's HTML
+  - peak traced memory (tracemalloc) while building and writing
+
+With --compare, any time, size or memory figure more than --threshold
+worse than the previous run is flagged and the exit code is 1.
+
+--parity instead builds both figure paths for every size and renderer and
+exits non-zero unless their serialised JSON is identical — the check that
+the fast path draws exactly the chart the go.Figure path does. It also
+checks that WebGL figures still hover inside the forecast bands, that
+extend_chart (watch mode) leaves the same figure as a rebuild, and that
+fetch_real_prices() over a price store larger than the point budgets
+(synced from a local CoinGecko stand-in) serves fewer points than the
+store holds, each tier within its budget.
+
+Usage:
+  python scripts/bench_chart.py [--sizes 30,365,1000,3000] [--out bench-chart.json]
+                                [--compare OLD.json] [--threshold 0.25]
+  python scripts/bench_chart.py --parity
+"""
+
+import os
+import sys
+import json
+import shutil
+import argparse
+import datetime
+import tempfile
+
+import plotly.io as pio
+
+import bench_common
+import bitcoin_chart
+import chart_html
+import coingecko_standin
+import digest_synth
+import market_data
+import price_store
+
+
+# ── 1. Synthetic inputs ───────────────────────────────────────────────────────
+# Digests come from digest_synth.py and prices from the CoinGecko stand-in's
+# walk, run through the same parsing, tiering and alignment as a real build.
+
+_UTC = datetime.timezone.utc
+
+
+def _today_utc():
+    """Midnight today (UTC), so a day's runs all see the same series."""
+    return datetime.datetime.combine(datetime.date.today(), datetime.time(), tzinfo=_UTC)
+
+
+def synthetic_digests(n, seed=0, end=None):
+    """`n` digest_synth digests ending at `end` (default today), as load_digests() returns them."""
+    tmp = tempfile.mkdtemp(prefix="chart-bench-digests-")
+    try:
+        manifest = digest_synth.write_corpus(tmp, n, seed=seed, end=end)
+        parsed = [bitcoin_chart.parse_digest(item["path"]) for item in manifest]
+    finally:
+        shutil.rmtree(tmp, ignore_errors=True)
+    return [p for p in parsed if p and p["actual_price"]]
+
+
+def _daily_rows(asset, currency, days, seed, now):
+    """[(date, price)] for the stand-in's daily series, the live point winning for today."""
+    rows = coingecko_standin.synthetic_prices(asset, currency, days, seed, now)
+    return sorted({datetime.datetime.fromtimestamp(ts / 1000, _UTC).date(): p for ts, p in rows}.items())
+
+
+def synthetic_prices(days=90, seed=0, now=None):
+    """fetch_real_prices() output, with the stand-in's walk in place of the price store."""
+    now    = now or _today_utc()
+    daily  = _daily_rows("bitcoin", "usd", days, seed, now)
+    recent = [(datetime.datetime.fromtimestamp(ts / 1000, _UTC).replace(tzinfo=None), p)
+              for ts, p in coingecko_standin.synthetic_prices(
+                  "bitcoin", "usd", bitcoin_chart.RECENT_DAYS, seed, now, interval=None)]
+    return bitcoin_chart.tier_prices(daily, recent)
+
+
+def synthetic_overlays(days=90, seed=0, now=None):
+    """fetch_many() output for ETH/USD and BTC/NZD from the stand-in's walk."""
+    now = now or _today_utc()
+    return price_store.align({pair: _daily_rows(*pair, days, seed, now)
+                              for pair in (("ethereum", "usd"), ("bitcoin", "nzd"))})
+
+
+# ── 2. Measurements ───────────────────────────────────────────────────────────
+
+def _serialise(fig):
+    if isinstance(fig, dict):
+        return pio.to_json(fig, validate=False)
+    return pio.to_json(fig)
+
+
+def _dir_bytes(path):
+    return sum(os.path.getsize(os.path.join(path, f)) for f in os.listdir(path)) if os.path.isdir(path) else 0
+
+
+def measure(days, repeat=3):
+    """One size: `days` of digests and prices, with two overlays."""
+    digests  = synthetic_digests(days)
+    prices   = synthetic_prices(days)
+    overlays = synthetic_overlays(min(days, 90))
+    build    = lambda fast: bitcoin_chart.build_chart(digests, prices, overlays, fast=fast)
+
+    build_s, fig  = bench_common.best_time(lambda: build(True), repeat)
+    build_go_s, _ = bench_common.best_time(lambda: build(False), repeat)
+
+    tmp = tempfile.mkdtemp(prefix="chart-bench-")
+    try:
+        page, data = os.path.join(tmp, "chart.html"), os.path.join(tmp, "chart-data")
+        write_s, chunks = bench_common.best_time(lambda: chart_html.write_split(fig, page, data), repeat)
+        shell_bytes, chunk_bytes = os.path.getsize(page), _dir_bytes(data)
+        peak = bench_common.peak_memory(lambda: chart_html.write_split(build(True), page, data))
+    finally:
+        shutil.rmtree(tmp, ignore_errors=True)
+
+    layout = fig["layout"]
+    return {
+        "digests":        len(digests),
+        "price_points":   len(prices),
+        "build_s":        round(build_s, 4),
+        "build_go_s":     round(build_go_s, 4),
+        "write_s":        round(write_s, 4),
+        "traces":         len(fig["data"]),
+        "shapes":         len(layout.get("shapes", [])),
+        "annotations":    len(layout.get("annotations", [])),
+        "chunks":         len(chunks),
+        "shell_bytes":    shell_bytes,
+        "chunk_bytes":    chunk_bytes,
+        "single_bytes":   len(chart_html.to_html(fig).encode()),
+        "plain_bytes":    len(pio.to_html(fig, include_plotlyjs="cdn", validate=False).encode()),
+        "peak_mem_bytes": peak,
+    }
+
+
+# ── 3. Reporting ──────────────────────────────────────────────────────────────
+
+# Metrics where bigger is worse, checked against --compare
+REGRESSION_METRICS = ("build_s", "write_s", "shell_bytes", "chunk_bytes", "peak_mem_bytes")
+
+
+def print_report(report, previous=None):
+    print(f"\n   {'days':>6} {'build':>9} {'go.Figure':>10} {'write':>9} {'traces':>7} "
+          f"{'shell':>9} {'chunks':>9} {'single':>9} {'plotly':>10} {'peak mem':>9}")
+    for size, r in report["results"].items():
+        print(f"   {int(size):>6,} {r['build_s'] * 1e3:>7.1f}ms {r['build_go_s'] * 1e3:>8.0f}ms "
+              f"{r['write_s'] * 1e3:>7.1f}ms {r['traces']:>7} "
+              f"{r['shell_bytes'] / 1e3:>7.0f}KB {r['chunk_bytes'] / 1e3:>7.0f}KB "
+              f"{r['single_bytes'] / 1e3:>7.0f}KB {r['plain_bytes'] / 1e3:>8.0f}KB "
+              f"{r['peak_mem_bytes'] / 1e6:>7.1f}MB")
+        prev = (previous or {}).get("results", {}).get(size)
+        if prev:
+            deltas = [f"{k} {(r[k] / prev[k] - 1) * 100:+.0f}%" for k in REGRESSION_METRICS
+                      if prev.get(k) and r.get(k) is not None]
+            print(f"   {'':>6} vs {bench_common.compared_to(previous)}: " + ", ".join(deltas))
+
+
+def regressions(report, previous, threshold):
+    """["<size> <metric> +x%", ...] for every metric more than `threshold` worse than `previous`."""
+    out = []
+    for size, r in report["results"].items():
+        prev = previous.get("results", {}).get(size, {})
+        for k in REGRESSION_METRICS:
+            if prev.get(k) and r.get(k) is not None and r[k] > prev[k] * (1 + threshold):
+                out.append(f"{size} days {k} {(r[k] / prev[k] - 1) * 100:+.0f}%")
+    return out
+
+
+# ── 4. Parity ─────────────────────────────────────────────────────────────────
+
+def _first_difference(a, b, path="$"):
+    """Path and values of the first place two decoded JSON documents differ, or None."""
+    if type(a) is not type(b):
+        return path, a, b
+    if isinstance(a, dict):
+        for k in sorted(set(a) | set(b)):
+            if k not in a or k not in b:
+                return f"{path}.{k}", a.get(k, "<missing>"), b.get(k, "<missing>")
+            diff = _first_difference(a[k], b[k], f"{path}.{k}")
+            if diff:
+                return diff
+        return None
+    if isinstance(a, list):
+        if len(a) != len(b):
+            return f"{path}[len]", len(a), len(b)
+        for i, (x, y) in enumerate(zip(a, b)):
+            diff = _first_difference(x, y, f"{path}[{i}]")
+            if diff:
+                return diff
+        return None
+    return None if a == b else (path, a, b)
+
+
+def parity(sizes):
+    """Compare both build paths' JSON for every size × renderer; return the number of mismatches."""
+    prices   = synthetic_prices()
+    overlays = synthetic_overlays()
+    failures = 0
+    for n in sizes:
+        digests = synthetic_digests(n)
+        for renderer in ("svg", "webgl", "auto"):
+            for ov in (None, overlays):
+                slow = json.loads(_serialise(bitcoin_chart.build_chart(digests, prices, ov, renderer)))
+                fast = json.loads(_serialise(bitcoin_chart.build_chart(digests, prices, ov, renderer,
+                                                                       fast=True)))
+                diff = _first_difference(slow, fast)
+                failures += diff is not None
+                label = f"{n:>6,} digests  {renderer:<5} {'overlays' if ov else 'btc only'}"
+                if diff:
+                    path, a, b = diff
+                    print(f"   ❌ {label}   {path}: {str(a)[:60]!r} ≠ {str(b)[:60]!r}")
+                else:
+                    print(f"   ✅ {label}   {len(slow['data'])} traces")
+                if renderer != "svg":
+                    failures += band_hover_check(slow, label)
+        failures += extend_parity(digests, prices, overlays)
+    failures += budget_check(max(max(sizes), 1000))
+    return failures
+
+
+def band_hover_check(fig, label):
+    """
+    The band hover traces of a WebGL figure must still be SVG scatters that
+    hover on their fill — Scattergl has no hoveron="fills", so the band
+    tooltips would only fire on the outline's corners. Returns 1 on a
+    failure, else 0.
+    """
+    outlines = [t for t in fig["data"] if (t.get("meta") or {}).get("role") == "outline"]
+    bad = [t for t in outlines
+           if t.get("type", "scatter") != "scatter" or t.get("fill") != "toself"
+           or "fills" not in t.get("hoveron", "")]
+    if outlines and not bad:
+        return 0
+    print(f"   ❌ {label}   {len(bad)} of {len(outlines)} band hover trace(s) "
+          f"can't hover inside the band")
+    return 1
+
+
+def budget_check(days):
+    """
+    Fill a temporary price store with `days` of daily prices, serve it with
+    fetch_real_prices() (intraday points synced from a local stand-in), and
+    check the result is within the point budgets and smaller than the store.
+    Returns 1 on a failure, else 0.
+    """
+    server = coingecko_standin.serve(port=0)
+    tmp    = tempfile.mkdtemp(prefix="chart-bench-store-")
+    saved  = bitcoin_chart.DIGEST_DIR, market_data.COINGECKO_API
+    try:
+        bitcoin_chart.DIGEST_DIR, market_data.COINGECKO_API = tmp, coingecko_standin.api_base(server)
+        daily = _daily_rows("bitcoin", "usd", days, 0, datetime.datetime.now(_UTC))
+        with price_store.PriceStore(tmp) as store:
+            store.upsert(daily, covered_from=daily[0][0])
+        served = bitcoin_chart.fetch_real_prices()
+        with price_store.PriceStore(tmp) as store:
+            stored = (len(store.window(days + 1))
+                      + len(store.intraday_window(bitcoin_chart.RECENT_DAYS)))
+    finally:
+        bitcoin_chart.DIGEST_DIR, market_data.COINGECKO_API = saved
+        server.shutdown()
+        shutil.rmtree(tmp, ignore_errors=True)
+
+    n_daily = bitcoin_chart._daily_count([t for t, _ in served])
+    ok = (n_daily <= bitcoin_chart.HISTORY_POINTS
+          and len(served) - n_daily <= bitcoin_chart.RECENT_POINTS
+          and len(served) < stored)
+    print(f"   {'✅' if ok else '❌'} {days:>6,} stored days  served {len(served):,} of {stored:,} "
+          f"points (daily {n_daily} ≤ {bitcoin_chart.HISTORY_POINTS}, "
+          f"intraday {len(served) - n_daily} ≤ {bitcoin_chart.RECENT_POINTS})")
+    return 0 if ok else 1
+
+
+def extend_parity(digests, prices, overlays):
+    """
+    Build without the newest digest, extend_chart it back in, and compare
+    with a full build. Its year-end target is dropped first, since a new
+    year-end target always rebuilds. Returns 1 on a mismatch, else 0.
+    """
+    base = digests[:-1]
+    new  = dict(digests[-1], forecasts={k: v for k, v in digests[-1]["forecasts"].items()
+                                        if not k.startswith("1y")})
+    before = {"1w": {"n": 10, "hit_rate": 0.5, "width_pct": 8.0, "bias_pct": 1.0, "miss_pct": 2.0}}
+    after  = {"1w": {"n": 11, "hit_rate": 0.6, "width_pct": 8.0, "bias_pct": 1.0, "miss_pct": 2.0}}
+    fig = bitcoin_chart.build_chart(base, prices, overlays, accuracy=before)
+    label = f"{len(digests):>6,} digests  extend_chart vs rebuild"
+    if not bitcoin_chart.extend_chart(fig, new, after):
+        print(f"   ❌ {label}   extend_chart asked for a rebuild")
+        return 1
+    full = bitcoin_chart.build_chart(base + [new], prices, overlays, accuracy=after)
+    diff = _first_difference(json.loads(_serialise(fig)), json.loads(_serialise(full)))
+    if diff:
+        path, a, b = diff
+        print(f"   ❌ {label}   {path}: {str(a)[:60]!r} ≠ {str(b)[:60]!r}")
+        return 1
+    print(f"   ✅ {label}")
+    return 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark bitcoin_chart.build_chart")
+    parser.add_argument("--sizes", default="30,365,1000,3000",
+                        help="comma-separated archive sizes in days (default 30,365,1000,3000)")
+    parser.add_argument("--repeat", type=int, default=3, help="timings are the best of N runs")
+    parser.add_argument("--out", default="bench-chart.json", help="where to save the JSON results")
+    parser.add_argument("--compare", help="previous results JSON to compare against")
+    parser.add_argument("--threshold", type=float, default=0.25,
+                        help="fail if a metric is this fraction worse than --compare (default 0.25)")
+    parser.add_argument("--parity", action="store_true",
+                        help="check the fast path's JSON matches the go.Figure path")
+    args = parser.parse_args()
+    sizes = sorted(int(s) for s in args.sizes.split(","))
+
+    if args.parity:
+        print("🔍 Comparing go.Figure and fast-path output...")
+        failures = parity(sizes)
+        if failures:
+            print(f"\n❌ {failures} mismatch(es)")
+            return 1
+        print("\n✅ Fast path and extend_chart match the go.Figure path; prices stay within budget")
+        return 0
+
+    report = bench_common.new_report()
+    for size in sizes:
+        print(f"⏱  Building a {size:,}-day chart...")
+        report["results"][str(size)] = measure(size, args.repeat)
+
+    previous = bench_common.load_report(args.compare)
+    print_report(report, previous)
+    bench_common.save_report(report, args.out)
+
+    if previous:
+        worse = regressions(report, previous, args.threshold)
+        if worse:
+            print(f"\n❌ {len(worse)} regression(s) over {args.threshold:.0%}:")
+            for line in worse:
+                print(f"   • {line}")
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,75 @@
+"""
+Benchmark Helpers
+Scaffolding shared by bench_chart.py and bench_digest_parse.py: the run
+metadata stamped on every report, best-of-N timing, peak traced memory,
+and loading / saving the JSON results that --compare reads back.
+"""
+
+import os
+import json
+import time
+import platform
+import datetime
+import tracemalloc
+import subprocess
+
+
+def git_commit():
+    """Short hash of the checked-out commit, or None outside a git checkout."""
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"],
+                              capture_output=True, text=True,
+                              cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip()
+    except OSError:
+        return None
+
+
+def new_report():
+    """Empty report carrying the run metadata; fill report["results"][size]."""
+    return {
+        "commit":    git_commit(),
+        "timestamp": datetime.datetime.now().isoformat(timespec="seconds"),
+        "python":    platform.python_version(),
+        "platform":  platform.platform(),
+        "results":   {},
+    }
+
+
+def best_time(fn, repeat=3):
+    """(best wall-clock seconds over `repeat` calls, result of the last call)."""
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - t0)
+    return best, result
+
+
+def peak_memory(fn):
+    """Peak bytes traced by tracemalloc while `fn()` runs (its result is dropped)."""
+    tracemalloc.start()
+    try:
+        fn()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return peak
+
+
+def load_report(path):
+    """A previous run's report for --compare, or None when no path is given."""
+    if not path:
+        return None
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def save_report(report, path):
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    print(f"\n✅ Results saved to: {path}")
+
+
+def compared_to(previous):
+    """How a --compare run is named in delta lines: its commit, else "previous"."""
+    return previous.get("commit") or "previous"
@@ -0,0 +1,176 @@
+"""
+Digest Parse Benchmark
+Times bitcoin_chart.parse_digest and bitcoin_weekly_slides.parse_digest over
+synthetic corpora (see digest_synth.py) and saves the results as JSON so runs
+can be compared across commits.
+
+Reports, per parser and corpus size:
+  - files/sec over the whole corpus
+  - mean µs per file for each price layout and each news layout
+  - peak traced memory (tracemalloc) while parsing and keeping the results
+  - price accuracy against the generator's ground truth
+
+--stress instead feeds adversarial digests (very long lines, thousands of $
+tokens, endless digit runs, …) through both parsers and exits non-zero if
+any single file takes longer than --bound seconds.
+
+Usage:
+  python scripts/bench_digest_parse.py [--sizes 100,10000,100000]
+                                       [--out bench-parse.json] [--compare OLD.json]
+  python scripts/bench_digest_parse.py --stress [--bound 0.5]
+"""
+
+import os
+import sys
+import time
+import shutil
+import argparse
+import tempfile
+from collections import defaultdict
+
+import bench_common
+import digest_cache
+import digest_synth
+import bitcoin_chart
+import bitcoin_weekly_slides
+
+PARSERS = {
+    "bitcoin_chart":         bitcoin_chart.parse_digest,
+    "bitcoin_weekly_slides": bitcoin_weekly_slides.parse_digest,
+}
+
+
+# ── 1. Measurements ───────────────────────────────────────────────────────────
+
+def _time_parser(parse_fn, manifest):
+    by_layout = defaultdict(list)
+    correct = 0
+    start = time.perf_counter()
+    for item in manifest:
+        t0 = time.perf_counter()
+        parsed = parse_fn(item["path"])
+        dt = time.perf_counter() - t0
+        by_layout[item["price_format"]].append(dt)
+        by_layout[item["news_format"]].append(dt)
+        if parsed and parsed["actual_price"] is not None and round(parsed["actual_price"]) == item["price"]:
+            correct += 1
+    total = time.perf_counter() - start
+    return total, by_layout, correct
+
+
+def bench(manifest):
+    out = {}
+    for name, parse_fn in PARSERS.items():
+        total, by_layout, correct = _time_parser(parse_fn, manifest)
+        out[name] = {
+            "files":          len(manifest),
+            "seconds":        round(total, 4),
+            "files_per_sec":  round(len(manifest) / total, 1) if total else None,
+            "us_per_file":    {k: round(sum(v) / len(v) * 1e6, 1) for k, v in sorted(by_layout.items())},
+            "peak_mem_bytes": bench_common.peak_memory(
+                lambda: [parse_fn(item["path"]) for item in manifest]),
+            "price_accuracy": round(correct / len(manifest), 4),
+        }
+    return out
+
+
+# ── 2. Reporting ──────────────────────────────────────────────────────────────
+
+def print_report(report, previous=None):
+    for size, parsers in report["results"].items():
+        print(f"\n── {size} files " + "─" * 50)
+        for name, r in parsers.items():
+            line = (f"   {name:<22} {r['files_per_sec']:>10,.0f} files/s   "
+                    f"peak {r['peak_mem_bytes'] / 1e6:7.1f} MB   accuracy {r['price_accuracy']:.1%}")
+            prev = (previous or {}).get("results", {}).get(size, {}).get(name)
+            if prev and prev.get("files_per_sec"):
+                delta = (r["files_per_sec"] / prev["files_per_sec"] - 1) * 100
+                line += f"   ({delta:+.1f}% vs {bench_common.compared_to(previous)})"
+            print(line)
+            print("      " + "  ".join(f"{k} {v:.0f}µs" for k, v in r["us_per_file"].items()))
+
+
+# ── 3. Stress ─────────────────────────────────────────────────────────────────
+
+def stress_cases(n=20000):
+    """Adversarial digest bodies aimed at the backtracking hot spots of each pattern."""
+    head = "# 比特币每日摘要 — 2026-03-01\n\n"
+    return {
+        "long_line":          head + "x" * (n * 50),
+        "many_dollars":       head + " ".join(["$1"] * n),
+        "dollar_commas":      head + "| 价格 | $" + "1," * n + " |",
+        "digits_no_percent":  head + "| **24小时涨跌幅** | " + "9" * n + " |",
+        "change_no_number":   head + ("24小时涨跌" + " " * 50) * (n // 20),
+        "forecast_no_label":  head + ("1 " + " " * 50) * (n // 20),
+        "plus_minus_spaces":  head + "| 1周 | $1 ±" + " " * n + "x |",
+        "many_bold":          head + "**a" * n,
+        "bold_news_no_body":  head + "## 📰 今日新闻\n\n" + "**标题**\n" * (n // 4),
+        "forecast_dollars":   head + "## 🔮 价格预测\n\n- **1周**：" + " $1 –" * n,
+        "year_end_no_dash":   head + "| 年底2026主流 | " + "$1K " * n + "|",
+    }
+
+
+def stress(bound):
+    """Parse every stress case with both parsers; return the number of cases over `bound`."""
+    tmp = tempfile.mkdtemp(prefix="digest-stress-")
+    failures = 0
+    try:
+        for case, body in stress_cases().items():
+            path = os.path.join(tmp, f"digest-2026-03-01-{case}.md")
+            with open(path, "w", encoding="utf-8") as f:
+                f.write(body)
+            for name, parse_fn in PARSERS.items():
+                t0 = time.perf_counter()
+                _, skipped = digest_cache.guarded_parse(parse_fn, path, budget=max(bound * 4, 1.0))
+                dt = time.perf_counter() - t0
+                ok = dt <= bound and not skipped
+                failures += not ok
+                note = f"   ({skipped})" if skipped else ""
+                print(f"   {'✅' if ok else '❌'} {case:<20} {name:<22} {dt * 1e3:9.1f} ms{note}")
+    finally:
+        shutil.rmtree(tmp, ignore_errors=True)
+    return failures
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the digest parsers")
+    parser.add_argument("--sizes", default="100,10000,100000",
+                        help="comma-separated corpus sizes (default 100,10000,100000)")
+    parser.add_argument("--out", default="bench-parse.json", help="where to save the JSON results")
+    parser.add_argument("--compare", help="previous results JSON to compare against")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--stress", action="store_true",
+                        help="run the adversarial inputs instead of the corpus benchmark")
+    parser.add_argument("--bound", type=float, default=0.5,
+                        help="max seconds per stress file (default 0.5)")
+    args = parser.parse_args()
+
+    if args.stress:
+        print(f"🧨 Stress-testing parsers (bound {args.bound:g}s per file)...")
+        failures = stress(args.bound)
+        if failures:
+            print(f"\n❌ {failures} case(s) over the bound")
+            return 1
+        print("\n✅ Every case stayed within the bound")
+        return 0
+
+    sizes = sorted(int(s) for s in args.sizes.split(","))
+    tmp = tempfile.mkdtemp(prefix="digest-bench-")
+    try:
+        print(f"📝 Generating {sizes[-1]:,} synthetic digests in {tmp}...")
+        manifest = digest_synth.write_corpus(tmp, sizes[-1], seed=args.seed)
+
+        report = bench_common.new_report()
+        for size in sizes:
+            print(f"⏱  Parsing {size:,} files...")
+            report["results"][str(size)] = bench(manifest[-size:])
+    finally:
+        shutil.rmtree(tmp, ignore_errors=True)
+
+    previous = bench_common.load_report(args.compare)
+    print_report(report, previous)
+    bench_common.save_report(report, args.out)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -6,164 +6,132 @@ and generates an interactive HTML chart.
 """
 
 import os
-import re
 import json
+import argparse
 import datetime
-import requests
-import glob
+from collections import Counter
 
 import plotly.graph_objects as go
+import plotly.io as pio
+
+import chart_html
+import digest_cache
+import digest_catalog
+import digest_parser
+import lttb
+import price_store
+import range_index
+
+try:
+    import backtest
+    import digest_store
+    _HAS_NUMPY = True
+except ImportError:
+    _HAS_NUMPY = False
 
 DIGEST_DIR  = os.path.expanduser("~/Documents/BitCoinNewsDaily")
 OUTPUT_FILE = os.path.join(DIGEST_DIR, "bitcoin-forecast-chart.html")
 REPO_DIR    = os.path.expanduser("~/Documents/GitHub1/claude_code_jshao")
 PAGES_FILE  = os.path.join(REPO_DIR, "docs", "index.html")
 
+# Older history is split off into per-year scripts in this directory, next to
+# the page (see chart_html.write_split)
+DATA_DIRNAME = "bitcoin-forecast-chart-data"
+OUTPUT_DATA  = os.path.join(DIGEST_DIR, DATA_DIRNAME)
+PAGES_DATA   = os.path.join(REPO_DIR, "docs", DATA_DIRNAME)
+
+# Bump when parse_digest's output changes so cached results are re-parsed
+PARSER_VERSION = 5
+
 
 # ── 1. Parse digest files ─────────────────────────────────────────────────────
 
 def parse_digest(filepath):
     """
     Extract date, actual price, and forecast ranges from a digest file.
-    Works with both English and Chinese digest formats.
+    Works with both English and Chinese digest formats (see digest_parser).
     """
+    date = digest_parser.date_from_filename(filepath)
+    if date is None:
+        return None
     with open(filepath, "r", encoding="utf-8") as f:
         content = f.read()
 
-    # ── Date from filename ────────────────────────────────────────────────
-    fname = os.path.basename(filepath)
-    date_match = re.search(r"(\d{4}-\d{2}-\d{2})", fname)
-    if not date_match:
-        return None
-    date = datetime.date.fromisoformat(date_match.group(1))
-
-    # ── Actual price ──────────────────────────────────────────────────────
-    # Look specifically inside the price table row to avoid catching prices
-    # mentioned in the summary text (e.g. "从高点约 $97,000 已跌去…")
-    actual_price = None
-
-    # Chinese format: | **价格（USD）** | $67,811 |
-    m = re.search(r"\|\s*\*\*价格[（(]USD[）)]\*\*\s*\|\s*\*?\*?\$\s*([\d,]+)", content)
-    if m:
-        actual_price = float(m.group(1).replace(",", ""))
-
-    # English format: | Price (USD) | **$67,341** |
-    if actual_price is None:
-        m = re.search(r"\|\s*\*?\*?Price[^|]*\|\s*\*?\*?\$\s*([\d,]+)", content)
-        if m:
-            actual_price = float(m.group(1).replace(",", ""))
-
-    # Chinese fallback: **约 $67,243 美元**  (used in older digest format)
-    if actual_price is None:
-        m = re.search(r"\*\*(?:约\s*)?\$\s*([\d,]+)\s*美元\*\*", content)
-        if m:
-            actual_price = float(m.group(1).replace(",", ""))
-
-    # Last-resort fallback: first table row with a 5+ digit dollar figure
-    if actual_price is None:
-        for line in content.splitlines():
-            if "|" in line:
-                m = re.search(r"\|\s*\*?\*?\$\s*([\d,]{5,})\s*\*?\*?\s*\|", line)
-                if m:
-                    actual_price = float(m.group(1).replace(",", ""))
-                    break
+    fields = digest_parser.parse(content)
 
     # ── Forecasts ─────────────────────────────────────────────────────────
-    # Find rows from the forecast table
-    # Handles both English ("1 Week", "1 Month") and Chinese ("1周", "1个月")
-
+    # Kept exactly as parsed (the column store records these); single targets
+    # are only widened into a band when drawn — see _forecast_band.
     forecasts = {}
-
-    def parse_forecast_line(pattern):
-        """
-        Parse a forecast line supporting two formats:
-          1. Target ± margin:  $69,500 ± $1,500  →  (68000, 71000)
-          2. Range:            $65,000–$73,300    →  (65000, 73300)
-        Returns (low, high) or None.
-        """
-        m = re.search(pattern, content, re.IGNORECASE)
-        if not m:
-            return None
-        line = m.group(0)
-        # Format 1: target ± margin
-        pm = re.search(r"\$([\d,]+)\s*[±\+\-]\s*\$?([\d,]+)", line)
-        if pm:
-            target = float(pm.group(1).replace(",", ""))
-            margin = float(pm.group(2).replace(",", ""))
-            return target - margin, target + margin
-        # Format 2: low–high range
-        rng = re.search(r"\$([\d,]+)[^\d$]+\$([\d,]+)", line)
-        if rng:
-            return float(rng.group(1).replace(",", "")), float(rng.group(2).replace(",", ""))
-        # Format 3: single value fallback (±0.5%)
-        sv = re.search(r"\$([\d,]+)", line)
-        if sv:
-            v = float(sv.group(1).replace(",", ""))
-            return v * 0.995, v * 1.005
-        return None
-
-    # 1-week
-    result = parse_forecast_line(r"(?:1\s*Week|下周|1周)[^\n]+")
-    if result:
-        forecasts["1w_low"], forecasts["1w_high"] = result
-
-    # 1-month
-    result = parse_forecast_line(r"(?:1\s*Month|1个月[（\(]?基准[）\)]?|1个月)[^\n]+")
-    if result:
-        forecasts["1m_low"], forecasts["1m_high"] = result
-
-    # 1-year (end of year) — consensus range
-    # Handles "$143,000", "$143K", "143,000" etc.
-    def parse_price_token(s):
-        s = s.replace(",", "").strip()
-        if s.endswith("K") or s.endswith("k"):
-            return float(s[:-1]) * 1000
-        return float(s)
-
-    year_match = re.search(
-        r"(?:1\s*Year|年底\d{4}[（\(]?主流|年底\d{4})[^\n]*?\$([\d,K]+)[^\n–-]*?[\-–]\s*\$([\d,K]+)",
-        content, re.IGNORECASE
-    )
-    if year_match:
-        forecasts["1y_low"] = parse_price_token(year_match.group(1))
-        forecasts["1y_high"] = parse_price_token(year_match.group(2))
+    for horizon in ("1w", "1m", "1y"):
+        fc = fields["forecasts"][horizon]
+        if fc:
+            forecasts[f"{horizon}_low"]  = fc["low"]
+            forecasts[f"{horizon}_high"] = fc["high"]
+            forecasts[f"{horizon}_kind"] = fc["kind"]
 
     return {
         "date": date,
-        "actual_price": actual_price,
+        "actual_price": fields["actual_price"],
+        "change_24h": fields["change_24h"],
         "forecasts": forecasts,
-        "file": fname,
+        "dialect": fields["dialect"],
+        "file": os.path.basename(filepath),
     }
 
 
-def load_digests():
-    files = sorted(glob.glob(os.path.join(DIGEST_DIR, "digest-*.md")))
-    results = []
-    for f in files:
-        parsed = parse_digest(f)
-        if parsed and parsed["actual_price"]:
-            results.append(parsed)
-    return results
+def load_digests(workers=None):
+    """
+    Parse every digest in DIGEST_DIR, oldest first.
+    `workers` > 1 (or 0 for all cores) parses new/changed files in parallel —
+    useful for backfills and archive rebuilds; small batches stay serial.
+    """
+    files = digest_catalog.DigestCatalog(DIGEST_DIR).range()
+    parsed_all = digest_cache.cached_parse(
+        files, parse_digest, DIGEST_DIR,
+        namespace="bitcoin_chart", version=PARSER_VERSION, prune=True,
+        workers=workers,
+    )
+    return [p for p in parsed_all if p and p["actual_price"]]
+
 
+# ── 2. Real BTC prices (local store, synced from CoinGecko) ──────────────────
 
-# ── 2. Fetch real BTC prices from CoinGecko ───────────────────────────────────
+# Point budgets: the last RECENT_DAYS are intraday so the 1W view has real
+# detail; older history is daily and reaches back as far as the store does
+# (the "All" view). Each tier is LTTB-downsampled to its budget, so the chart
+# stays the same size however much history the store accumulates.
+RECENT_DAYS    = 7
+RECENT_POINTS  = 500
+HISTORY_POINTS = 400
+
+# Days of daily prices kept synced from CoinGecko (its public API's history
+# limit); older days stay in the store and are still served
+SYNC_DAYS = 365
 
-def fetch_real_prices(days=90):
-    url = "https://api.coingecko.com/api/v3/coins/bitcoin/market_chart"
-    params = {"vs_currency": "usd", "days": days, "interval": "daily"}
-    try:
-        resp = requests.get(url, params=params, timeout=15)
-        resp.raise_for_status()
-        data = resp.json()
-        prices = data.get("prices", [])
-        result = []
-        for ts_ms, price in prices:
-            dt = datetime.datetime.utcfromtimestamp(ts_ms / 1000).date()
-            result.append((dt, price))
-        return result
-    except Exception as e:
-        print(f"Warning: Could not fetch CoinGecko data — {e}")
-        return []
+
+def fetch_real_prices(days=SYNC_DAYS):
+    """
+    Return [(datetime, price)] (naive UTC, oldest first) for every day in
+    the local price store (see price_store.py), after syncing the last
+    `days` days — it only downloads what it is missing and keeps working
+    offline.
+    """
+    return tier_prices(price_store.history(DIGEST_DIR, days),
+                       price_store.intraday_prices(DIGEST_DIR, RECENT_DAYS))
+
+
+def tier_prices(daily, recent):
+    """
+    One chart series from [(date, price)] daily history and [(datetime,
+    price)] intraday points: daily up to where the intraday points start,
+    each tier LTTB-downsampled to its point budget.
+    """
+    cutoff = recent[0][0] if recent else None
+    history = [(datetime.datetime.combine(d, datetime.time()), p) for d, p in daily]
+    if cutoff:
+        history = [(t, p) for t, p in history if t < cutoff]
+    return lttb.downsample(history, HISTORY_POINTS) + lttb.downsample(recent, RECENT_POINTS)
 
 
 # ── 3. Build Plotly chart ─────────────────────────────────────────────────────
@@ -176,20 +144,70 @@ C_1M_RGB     = "16,185,129"           # green
 C_YE_line    = "#D97706"              # amber for year-end
 C_GRID       = "rgba(203,213,225,0.6)"
 C_AXIS       = "#94a3b8"
+C_OVERLAYS   = ["#6366f1", "#0ea5e9", "#a855f7", "#14b8a6", "#f43f5e", "#84cc16"]
+
+# Above this many data points (price line + digest markers) renderer="auto"
+# draws them with WebGL instead of SVG
+WEBGL_POINT_THRESHOLD = 2000
+
+# Range buttons: (label, days back, days of forecast ahead); None = whole series
+VIEW_PRESETS = [
+    ("1W",   7,    3),
+    ("1M",   30,   7),
+    ("3M",   90,   14),
+    ("All",  None, None),
+]
+
+# CoinGecko id → ticker, for overlay legend names
+ASSET_TICKERS = {"bitcoin": "BTC", "ethereum": "ETH", "solana": "SOL",
+                 "ripple": "XRP", "binancecoin": "BNB", "cardano": "ADA"}
 
 
-def _hl_annotations(dates, prices, window_start, base_anns):
-    """Return base_anns + high/low annotations for prices within window_start..today."""
-    pairs = [(d, p) for d, p in zip(dates, prices) if d >= window_start]
-    if not pairs:
+def _as_datetime(x):
+    return x if isinstance(x, datetime.datetime) else datetime.datetime.combine(x, datetime.time())
+
+
+def _daily_count(dates):
+    """
+    How many leading points of a fetch_real_prices() series are daily
+    history — midnight points at least a day apart — before the intraday
+    tail starts.
+    """
+    for i, t in enumerate(dates):
+        if _as_datetime(t).time() != datetime.time() or (
+                i and _as_datetime(t) - _as_datetime(dates[i - 1]) < datetime.timedelta(days=1)):
+            return i
+    return len(dates)
+
+
+def _forecast_band(fc, key):
+    """
+    (low, high) to draw for a 1W/1M forecast, or None. A single target is
+    widened to ±0.5% so it still draws as a band.
+    """
+    if f"{key}_low" not in fc or f"{key}_high" not in fc:
+        return None
+    if fc.get(f"{key}_kind") == "single":
+        return fc[f"{key}_low"] * 0.995, fc[f"{key}_high"] * 1.005
+    return fc[f"{key}_low"], fc[f"{key}_high"]
+
+
+def _has_year_end(fc):
+    """The year-end consensus is only drawn when it is an actual range."""
+    return "1y_low" in fc and fc.get("1y_kind") != "single"
+
+
+def _hl_annotations(index, window_start, base_anns):
+    """Return base_anns + high/low annotations for the prices in `index` from window_start on."""
+    if window_start is not None:
+        window_start = _as_datetime(window_start)
+    hi, lo = index.high(window_start), index.low(window_start)
+    if hi is None:
         return list(base_anns)
-    w_dates, w_prices = zip(*pairs)
-    hi_i = w_prices.index(max(w_prices))
-    lo_i = w_prices.index(min(w_prices))
     return list(base_anns) + [
         dict(
-            x=str(w_dates[hi_i]), y=w_prices[hi_i],
-            text=f"<b>High: ${w_prices[hi_i]:,.0f}</b>",
+            x=str(hi[0]), y=hi[1],
+            text=f"<b>High: ${hi[1]:,.0f}</b>",
             xanchor="center", yanchor="bottom",
             showarrow=True, arrowhead=2, arrowcolor="#16a34a", arrowsize=0.8,
             ax=0, ay=-36,
@@ -198,8 +216,8 @@ def _hl_annotations(dates, prices, window_start, base_anns):
             bordercolor="#16a34a", borderwidth=1, borderpad=4,
         ),
         dict(
-            x=str(w_dates[lo_i]), y=w_prices[lo_i],
-            text=f"<b>Low: ${w_prices[lo_i]:,.0f}</b>",
+            x=str(lo[0]), y=lo[1],
+            text=f"<b>Low: ${lo[1]:,.0f}</b>",
             xanchor="center", yanchor="top",
             showarrow=True, arrowhead=2, arrowcolor="#dc2626", arrowsize=0.8,
             ax=0, ay=36,
@@ -210,38 +228,165 @@ def _hl_annotations(dates, prices, window_start, base_anns):
     ]
 
 
-def build_chart(digests, real_prices):
-    fig = go.Figure()
+def _accuracy_annotation(accuracy):
+    """Top-right panel summarising backtest.backtest() output, or None if nothing has matured."""
+    lines = []
+    for key, label, rgb in (("1w", "1W", C_1W_RGB), ("1m", "1M", C_1M_RGB)):
+        r = (accuracy or {}).get(key, {})
+        if r.get("n"):
+            lines.append(f"<span style='color:rgb({rgb})'><b>{label}</b></span> "
+                         f"{r['hit_rate']:.0%} in range · ±{r['width_pct'] / 2:.1f}% · "
+                         f"bias {r['bias_pct']:+.1f}% · n={r['n']}")
+    if not lines:
+        return None
+    return dict(
+        xref="paper", yref="paper", x=1, y=1.12,
+        xanchor="right", yanchor="top", align="left", showarrow=False,
+        text="<b>Forecast accuracy</b><br>" + "<br>".join(lines),
+        font=dict(size=11, color="#334155"),
+        bgcolor="rgba(255,255,255,0.92)",
+        bordercolor="#cbd5e1", borderwidth=1, borderpad=5,
+    )
+
 
-    # ── Forecast bands (drawn first, behind everything) ───────────────────
-    first_1w = True
-    first_1m = True
+def _title_text(today):
+    return ("<b>Bitcoin · Actual Price vs Forecast Ranges</b>"
+            f"<br><sup style='color:#64748b'>Updated {today.strftime('%B %d, %Y')}</sup>")
+
+
+def _y_range(values):
+    """Default y-axis range: the given prices with 6% headroom either side."""
+    if not values:
+        return [0, 200000]
+    return [min(values) * 0.94, max(values) * 1.06]
+
+
+def _is_accuracy_annotation(ann):
+    return str(ann["text"] or "").startswith("<b>Forecast accuracy</b>")
+
+
+def _use_webgl(renderer, n_points):
+    return renderer == "webgl" or (renderer == "auto" and n_points > WEBGL_POINT_THRESHOLD)
+
+
+def _view_button(label, back, ahead, today, price_index, base_anns):
+    """One range button: zoom to the window and move the high/low labels into it."""
+    if back is None:
+        return dict(label=label, method="relayout", args=[{
+            "xaxis.autorange": True,
+            "annotations": _hl_annotations(price_index, None, base_anns),
+        }])
+    start = today - datetime.timedelta(days=back)
+    return dict(label=label, method="relayout", args=[{
+        "xaxis.range": [start.isoformat(), (today + datetime.timedelta(days=ahead)).isoformat()],
+        "annotations": _hl_annotations(price_index, start, base_anns),
+    }])
+
+
+def _scatter_class(renderer, n_points):
+    """go.Scattergl for renderer "webgl" (or "auto" past the threshold), else go.Scatter."""
+    return go.Scattergl if _use_webgl(renderer, n_points) else go.Scatter
+
+
+# ── Fast path: the figure as plain dicts ─────────────────────────────────────
+# go.Figure validates every add_trace / add_shape / update_layout call, which
+# dominates build time on large archives. _FigureDict offers the same three
+# methods over a plain {"data", "layout"} dict, and _trace() stands in for
+# go.Scatter / go.Scattergl, so build_chart runs unchanged on either and the
+# fast figure is validated never — it is serialised once by write_chart.
+
+def _trace(trace_type):
+    """Dict-building stand-in for go.Scatter / go.Scattergl."""
+    def make(**props):
+        return {"type": trace_type, **props}
+    return make
+
+
+def _merge(dst, src):
+    """update_layout semantics: nested dicts merge key by key, everything else replaces."""
+    for k, v in src.items():
+        if isinstance(v, dict) and isinstance(dst.get(k), dict):
+            _merge(dst[k], v)
+        else:
+            dst[k] = v
+    return dst
+
+
+_template_cache = {}
 
+
+def _default_template():
+    """The active default template as a dict (go.Figure embeds it on serialisation)."""
+    name = pio.templates.default
+    if name not in _template_cache:
+        _template_cache[name] = pio.templates[name].to_plotly_json() if name else None
+    return _template_cache[name]
+
+
+class _FigureDict:
+    """Just enough of go.Figure's building API to run build_chart without validation."""
+
+    def __init__(self):
+        self.data   = []
+        self.layout = {}
+
+    def add_trace(self, trace):
+        self.data.append(trace)
+        return self
+
+    def add_shape(self, **shape):
+        self.layout.setdefault("shapes", []).append(shape)
+        return self
+
+    def update_layout(self, **props):
+        _merge(self.layout, props)
+        return self
+
+    def to_dict(self):
+        layout = dict(self.layout)
+        template = _default_template()
+        if template is not None and "template" not in layout:
+            layout["template"] = template
+        return {"data": self.data, "layout": layout}
+
+
+def build_chart(digests, real_prices, overlays=None, renderer="auto", fast=False, accuracy=None):
+    """
+    `overlays` is price_store.fetch_many() output — (dates, {(asset, currency):
+    prices}) — drawn as % change on a second axis, hidden until toggled.
+    `accuracy` is backtest.backtest() output, shown as a panel top-right.
+    `renderer` is "svg", "webgl" or "auto": with WebGL the price line, digest
+    markers and overlays become Scattergl traces. The forecast bands always
+    stay SVG: Scattergl has no hover on filled areas, so the band tooltips
+    would be lost.
+    `fast=True` returns a plain figure dict built without plotly's property
+    validation (same JSON as the go.Figure; see bench_chart.py --parity).
+    extend_chart needs the go.Figure, so watch mode keeps fast=False.
+    """
+    fig = _FigureDict() if fast else go.Figure()
+    SvgScatter = _trace("scatter") if fast else go.Scatter
+
+    # ── Forecast bands (drawn first, behind everything) ───────────────────
+    bands = {"1w": [], "1m": []}
     for d in digests:
-        digest_date = d["date"]
         fc = d["forecasts"]
+        for key, days in (("1w", 7), ("1m", 30)):
+            band = _forecast_band(fc, key)
+            if band:
+                bands[key].append((d["date"], d["date"] + datetime.timedelta(days=days), *band))
+
+    n_points = len(real_prices or []) + len(digests)
+    if fast:
+        Scatter = _trace("scattergl" if _use_webgl(renderer, n_points) else "scatter")
+    else:
+        Scatter = _scatter_class(renderer, n_points)
 
-        if "1w_low" in fc and "1w_high" in fc:
-            end_1w = digest_date + datetime.timedelta(days=7)
-            _add_band(fig, digest_date, end_1w, fc["1w_low"], fc["1w_high"],
-                      base_rgb=C_1W_RGB,
-                      legend_name="1-Week Forecast Range",
-                      show_legend=first_1w, legend_group="1w",
-                      hover_date=digest_date)
-            first_1w = False
-
-        if "1m_low" in fc and "1m_high" in fc:
-            end_1m = digest_date + datetime.timedelta(days=30)
-            _add_band(fig, digest_date, end_1m, fc["1m_low"], fc["1m_high"],
-                      base_rgb=C_1M_RGB,
-                      legend_name="1-Month Forecast Range",
-                      show_legend=first_1m, legend_group="1m",
-                      hover_date=digest_date)
-            first_1m = False
+    _add_bands(fig, bands["1w"], C_1W_RGB, "1-Week Forecast Range", "1w", SvgScatter)
+    _add_bands(fig, bands["1m"], C_1M_RGB, "1-Month Forecast Range", "1m", SvgScatter)
 
     # ── Year-end target lines ─────────────────────────────────────────────
     ye_anns = []
-    ye_digest = next((d for d in reversed(digests) if "1y_low" in d["forecasts"]), None)
+    ye_digest = next((d for d in reversed(digests) if _has_year_end(d["forecasts"])), None)
     if ye_digest:
         fc = ye_digest["forecasts"]
         x0 = ye_digest["date"]
@@ -258,33 +403,45 @@ def build_chart(digests, real_prices):
                 font=dict(size=10, color=C_YE_line),
                 bgcolor="rgba(255,255,255,0.8)", borderpad=4,
             ))
-        fig.add_trace(go.Scatter(
+        fig.add_trace(SvgScatter(
             x=[None], y=[None], mode="lines",
             line=dict(color=C_YE_line, width=1.5, dash="dot"),
             name=f"Year-End Target ({x0.year})", showlegend=True,
         ))
 
     # ── Actual price line ─────────────────────────────────────────────────
+    price_index = range_index.RangeIndex(real_prices or [])
+    base_anns   = list(ye_anns)
     if real_prices:
         dates_real  = [r[0] for r in real_prices]
         prices_real = [r[1] for r in real_prices]
-
-        # Baseline trace at the minimum price (creates a tight fill band)
-        price_min = min(prices_real) * 0.995
-        fig.add_trace(go.Scatter(
-            x=dates_real, y=[price_min] * len(dates_real),
-            mode="lines", line=dict(width=0),
-            showlegend=False, hoverinfo="skip",
-        ))
-
-        # Price line with fill down to the baseline
-        fig.add_trace(go.Scatter(
-            x=dates_real, y=prices_real,
-            mode="lines", name="BTC Actual Price",
-            line=dict(color=C_PRICE, width=2.5),
-            fill="tonexty", fillcolor=C_PRICE_FILL,
-            hovertemplate="<b>%{x|%b %d, %Y}</b><br>Price: <b>$%{y:,.0f}</b><extra></extra>",
-        ))
+        price_min   = min(prices_real) * 0.995
+
+        # Daily history and the intraday tail are separate traces so each
+        # hover shows the time only where there is one. Each segment fills
+        # down to its own baseline at the minimum price (a tight fill band).
+        n_daily = _daily_count(dates_real)
+        segments = []
+        if n_daily:
+            segments.append((0, n_daily, "%b %d, %Y"))
+        if n_daily < len(dates_real):
+            # starts on the last daily point so the line and fill stay joined
+            segments.append((max(n_daily - 1, 0), len(dates_real), "%b %d, %Y %H:%M"))
+        for i, (lo, hi, fmt) in enumerate(segments):
+            xs, ys = dates_real[lo:hi], prices_real[lo:hi]
+            fig.add_trace(Scatter(
+                x=xs, y=[price_min] * len(xs),
+                mode="lines", line=dict(width=0),
+                showlegend=False, hoverinfo="skip",
+            ))
+            fig.add_trace(Scatter(
+                x=xs, y=ys,
+                mode="lines", name="BTC Actual Price",
+                line=dict(color=C_PRICE, width=2.5),
+                fill="tonexty", fillcolor=C_PRICE_FILL,
+                legendgroup="price", showlegend=i == 0,
+                hovertemplate=f"<b>%{{x|{fmt}}}</b><br>Price: <b>$%{{y:,.0f}}</b><extra></extra>",
+            ))
 
         # Latest price label — stored for reuse in all annotation sets
         latest_date  = dates_real[-1]
@@ -298,11 +455,16 @@ def build_chart(digests, real_prices):
             bgcolor="rgba(255,255,255,0.85)",
             borderpad=4, xshift=8,
         )
+        base_anns = [latest_ann] + ye_anns
+
+    accuracy_ann = _accuracy_annotation(accuracy)
+    if accuracy_ann:
+        base_anns.append(accuracy_ann)
 
     # ── Digest price markers ──────────────────────────────────────────────
     marker_dates  = [d["date"]         for d in digests]
     marker_prices = [d["actual_price"] for d in digests]
-    fig.add_trace(go.Scatter(
+    fig.add_trace(Scatter(
         x=marker_dates, y=marker_prices,
         mode="markers", name="Recorded Price (digest)",
         marker=dict(size=8, color="white", symbol="circle",
@@ -319,33 +481,27 @@ def build_chart(digests, real_prices):
     visible_prices = [p for d, p in real_prices] if real_prices else []
     near_fc_prices = []
     for d in digests:
-        fc = d["forecasts"]
-        near_fc_prices += [v for k, v in fc.items() if k in ("1w_low","1w_high","1m_low","1m_high")]
-    all_visible = visible_prices + near_fc_prices
-    y_min = min(all_visible) * 0.94 if all_visible else 0
-    y_max = max(all_visible) * 1.06 if all_visible else 200000
+        for key in ("1w", "1m"):
+            near_fc_prices += _forecast_band(d["forecasts"], key) or ()
+    y_min, y_max = _y_range(visible_prices + near_fc_prices)
 
     # ── Layout ────────────────────────────────────────────────────────────
     fig.update_layout(
         title=dict(
-            text=(
-                "<b>Bitcoin · Actual Price vs Forecast Ranges</b>"
-                f"<br><sup style='color:#64748b'>Updated {today.strftime('%B %d, %Y')}</sup>"
-            ),
+            text=_title_text(today),
             font=dict(size=20, color="#0f172a", family="Georgia, serif"),
             x=0.0, xanchor="left", pad=dict(l=10),
         ),
         xaxis=dict(
             showgrid=True, gridcolor=C_GRID, gridwidth=1,
             linecolor=C_AXIS, tickcolor=C_AXIS, tickfont=dict(color="#475569"),
-            title=None,
             range=[x_start.isoformat(), x_end.isoformat()],
             rangeslider=dict(visible=True, thickness=0.05, bgcolor="#f8fafc"),
         ),
         yaxis=dict(
             showgrid=True, gridcolor=C_GRID, gridwidth=1,
             linecolor=C_AXIS, tickcolor=C_AXIS, tickfont=dict(color="#475569"),
-            tickformat="$,.0f", title=None,
+            tickformat="$,.0f",
             side="right",
             range=[y_min, y_max],
         ),
@@ -357,49 +513,8 @@ def build_chart(digests, real_prices):
             bgcolor="#f1f5f9",
             bordercolor=C_GRID, borderwidth=1,
             font=dict(size=11, color="#334155"),
-            buttons=[
-                dict(label="1W", method="relayout", args=[{
-                    "xaxis.range": [
-                        (today - datetime.timedelta(days=7)).isoformat(),
-                        (today + datetime.timedelta(days=3)).isoformat(),
-                    ],
-                    "annotations": _hl_annotations(
-                        dates_real, prices_real,
-                        today - datetime.timedelta(days=7),
-                        [latest_ann] + ye_anns
-                    ),
-                }]),
-                dict(label="1M", method="relayout", args=[{
-                    "xaxis.range": [
-                        (today - datetime.timedelta(days=30)).isoformat(),
-                        (today + datetime.timedelta(days=7)).isoformat(),
-                    ],
-                    "annotations": _hl_annotations(
-                        dates_real, prices_real,
-                        today - datetime.timedelta(days=30),
-                        [latest_ann] + ye_anns
-                    ),
-                }]),
-                dict(label="3M", method="relayout", args=[{
-                    "xaxis.range": [
-                        (today - datetime.timedelta(days=90)).isoformat(),
-                        (today + datetime.timedelta(days=14)).isoformat(),
-                    ],
-                    "annotations": _hl_annotations(
-                        dates_real, prices_real,
-                        today - datetime.timedelta(days=90),
-                        [latest_ann] + ye_anns
-                    ),
-                }]),
-                dict(label="All", method="relayout", args=[{
-                    "xaxis.autorange": True,
-                    "annotations": _hl_annotations(
-                        dates_real, prices_real,
-                        dates_real[0],
-                        [latest_ann] + ye_anns
-                    ),
-                }]),
-            ],
+            buttons=[_view_button(label, back, ahead, today, price_index, base_anns)
+                     for label, back, ahead in VIEW_PRESETS],
         )],
         dragmode="pan",
         hovermode="x unified",
@@ -424,13 +539,32 @@ def build_chart(digests, real_prices):
         height=580,
     )
 
-    # ── Default annotations (3M view = default window) ───────────────────
-    if real_prices:
-        default_anns = _hl_annotations(
-            dates_real, prices_real,
-            today - datetime.timedelta(days=90),
-            [latest_ann] + ye_anns
+    # ── Other assets / currencies (% change, left axis) ──────────────────
+    if overlays and overlays[0]:
+        ov_dates, ov_series = overlays
+        for i, ((asset, currency), prices) in enumerate(ov_series.items()):
+            name = f"{ASSET_TICKERS.get(asset, asset.upper())}/{currency.upper()}"
+            fig.add_trace(Scatter(
+                x=ov_dates, y=[p / prices[0] - 1 for p in prices],
+                mode="lines", name=f"{name} (% change)", yaxis="y2",
+                visible="legendonly",
+                line=dict(color=C_OVERLAYS[i % len(C_OVERLAYS)], width=1.5),
+                customdata=prices,
+                hovertemplate=(f"<b>{name}</b> %{{y:+.1%}}"
+                               f" · %{{customdata:,.2f}} {currency.upper()}<extra></extra>"),
+            ))
+        fig.update_layout(
+            yaxis2=dict(
+                overlaying="y", side="left", showgrid=False,
+                tickformat="+.0%", zeroline=True, zerolinecolor=C_GRID,
+                linecolor=C_AXIS, tickcolor=C_AXIS, tickfont=dict(color="#475569"),
+            ),
+            margin=dict(l=60),
         )
+
+    # ── Default annotations (3M view = default window) ───────────────────
+    if base_anns:
+        default_anns = _hl_annotations(price_index, today - datetime.timedelta(days=90), base_anns)
         fig.update_layout(annotations=default_anns)
 
     # Subtle top border line
@@ -438,93 +572,210 @@ def build_chart(digests, real_prices):
                   x0=0, x1=1, y0=1, y1=1,
                   line=dict(color=C_PRICE, width=3))
 
-    return fig
+    return fig.to_dict() if fast else fig
+
+
+BAND_SLICES = 12
 
 
-def _add_band(fig, x0, x1, low, high, base_rgb,
-              legend_name, show_legend, legend_group, hover_date):
+def _band_parts(x0, x1, low, high):
     """
-    Fading gradient forecast band.
-    Solid at x0, fades to transparent at x1 using N vertical slices.
+    Coordinates for one fading band, each ending in a None gap so bands can
+    be concatenated into shared traces:
+      slices  — BAND_SLICES vertical strips, solid at x0, fading out by x1
+      outline — the whole band (for hover), with its start date as customdata
+      edge    — the solid left edge line
     """
-    N = 12
-    total_days = max((x1 - x0).days, 1)
-    slice_days = total_days / N
+    slice_days = max((x1 - x0).days, 1) / BAND_SLICES
+    slices = []
+    for i in range(BAND_SLICES):
+        sx0 = x0 + datetime.timedelta(days=i * slice_days)
+        sx1 = x0 + datetime.timedelta(days=(i + 1) * slice_days)
+        slices.append(([sx0, sx1, sx1, sx0, sx0, None], [low, low, high, high, low, None]))
+    return {
+        "slices":  slices,
+        "outline": ([x0, x1, x1, x0, x0, None], [low, low, high, high, low, None],
+                    [str(x0)] * 5 + [None]),
+        "edge":    ([x0, x0, None], [low, high, None]),
+    }
 
-    for i in range(N):
-        # Opacity curve: starts at 0.30, fades with a smooth curve
-        alpha = 0.30 * ((N - i) / N) ** 1.8
-        slice_x0 = x0 + datetime.timedelta(days=i * slice_days)
-        slice_x1 = x0 + datetime.timedelta(days=(i + 1) * slice_days)
 
-        fig.add_trace(go.Scatter(
-            x=[slice_x0, slice_x1, slice_x1, slice_x0, slice_x0],
-            y=[low, low, high, high, low],
+def _add_bands(fig, bands, base_rgb, legend_name, legend_group, scatter=go.Scatter):
+    """
+    Draw every [(x0, x1, low, high)] forecast band of one horizon as fading
+    gradients. Slice i of every band goes into the same None-separated
+    trace, so a horizon costs BAND_SLICES + 2 traces however many digests
+    there are. Traces are tagged with meta={"band", "role"} for extend_chart.
+    `scatter` is go.Scatter or the fast path's stand-in, never Scattergl:
+    the hover layer needs hoveron="fills", which WebGL traces lack.
+    """
+    if not bands:
+        return
+    parts = [_band_parts(*b) for b in bands]
+
+    for i in range(BAND_SLICES):
+        # Opacity curve: starts at 0.30, fades with a smooth curve
+        alpha = 0.30 * ((BAND_SLICES - i) / BAND_SLICES) ** 1.8
+        fig.add_trace(scatter(
+            x=[x for p in parts for x in p["slices"][i][0]],
+            y=[y for p in parts for y in p["slices"][i][1]],
             fill="toself",
             fillcolor=f"rgba({base_rgb},{alpha:.3f})",
             line=dict(width=0),
             mode="lines",
             legendgroup=legend_group,
-            showlegend=(show_legend and i == 0),
+            showlegend=(i == 0),
             name=legend_name,
             hoverinfo="skip",
+            meta={"band": legend_group, "role": f"slice{i}"},
         ))
 
-    # Solid left edge line
-    edge_color = f"rgba({base_rgb},0.7)"
-    fig.add_shape(type="line", x0=x0, x1=x0, y0=low, y1=high,
-                  line=dict(color=edge_color, width=2))
+    # Solid left edge lines
+    fig.add_trace(scatter(
+        x=[x for p in parts for x in p["edge"][0]],
+        y=[y for p in parts for y in p["edge"][1]],
+        mode="lines", line=dict(color=f"rgba({base_rgb},0.7)", width=2),
+        legendgroup=legend_group, showlegend=False, hoverinfo="skip",
+        meta={"band": legend_group, "role": "edge"},
+    ))
 
-    # Invisible hover trace over full band
-    fig.add_trace(go.Scatter(
-        x=[x0, x1, x1, x0, x0],
-        y=[low, low, high, high, low],
-        fill="toself", fillcolor="rgba(0,0,0,0)",
+    # Invisible hover trace over each full band
+    fig.add_trace(scatter(
+        x=[x for p in parts for x in p["outline"][0]],
+        y=[y for p in parts for y in p["outline"][1]],
+        customdata=[c for p in parts for c in p["outline"][2]],
+        fill="toself", fillcolor="rgba(0,0,0,0)", hoveron="fills",
         line=dict(width=0), mode="lines",
         legendgroup=legend_group, showlegend=False,
         hovertemplate=(
             f"<b>{legend_name}</b><br>"
-            f"From: {hover_date}<br>"
-            f"$%{{y:,.0f}}<extra></extra>"
+            "From: %{customdata}<br>"
+            "$%{y:,.0f}<extra></extra>"
         ),
+        meta={"band": legend_group, "role": "outline"},
     ))
 
 
-# ── 4. Main ───────────────────────────────────────────────────────────────────
-
-def main():
-    print("📂 Reading digest files...")
-    digests = load_digests()
-    if not digests:
-        print("❌ No digest files found. Run /bitcoin first to generate them.")
-        return
-
-    print(f"   Found {len(digests)} digest(s):")
-    for d in digests:
-        print(f"   • {d['date']}  price: ${d['actual_price']:,.0f}  forecasts: {d['forecasts']}")
+def extend_chart(fig, digest, accuracy=None):
+    """
+    Append one new digest to an already-built figure in place: its 1W/1M
+    forecast bands (added to the existing band traces) and its recorded-price
+    marker. The layout fields a rebuild would change follow along — the
+    y-axis range widens to fit the new bands, the title takes today's date,
+    and with `accuracy` (backtest.backtest() output) the accuracy panel is
+    redrawn in the default view and every range button. The price line,
+    its high/low labels and the overlays only depend on prices, which a
+    digest does not change.
+
+    Returns False when the digest changes something only a full rebuild
+    can (a new year-end target, a horizon with no band traces yet, or the
+    accuracy panel appearing or disappearing), in which case the figure is
+    left untouched.
+    """
+    fc = digest["forecasts"]
+    if _has_year_end(fc):
+        return False
+
+    band_traces = {}
+    for t in fig.data:
+        if isinstance(t.meta, dict) and "band" in t.meta:
+            band_traces.setdefault(t.meta["band"], {})[t.meta["role"]] = t
+    new = {}
+    new_prices = []
+    for key, days in (("1w", 7), ("1m", 30)):
+        band = _forecast_band(fc, key)
+        if band:
+            if key not in band_traces:
+                return False
+            new[key] = _band_parts(digest["date"], digest["date"] + datetime.timedelta(days=days),
+                                   *band)
+            new_prices += band
+
+    accuracy_ann = _accuracy_annotation(accuracy) if accuracy is not None else None
+    if accuracy is not None:
+        had_panel = any(_is_accuracy_annotation(a) for a in fig.layout.annotations)
+        if had_panel != (accuracy_ann is not None):
+            return False
+
+    for key, parts in new.items():
+        traces = band_traces[key]
+        for i, (xs, ys) in enumerate(parts["slices"]):
+            t = traces[f"slice{i}"]
+            t.x, t.y = tuple(t.x) + tuple(xs), tuple(t.y) + tuple(ys)
+        t = traces["edge"]
+        t.x, t.y = tuple(t.x) + tuple(parts["edge"][0]), tuple(t.y) + tuple(parts["edge"][1])
+        t = traces["outline"]
+        xs, ys, cd = parts["outline"]
+        t.x, t.y = tuple(t.x) + tuple(xs), tuple(t.y) + tuple(ys)
+        t.customdata = tuple(t.customdata) + tuple(cd)
+
+    for t in fig.data:
+        if t.name == "Recorded Price (digest)":
+            t.x = tuple(t.x) + (digest["date"],)
+            t.y = tuple(t.y) + (digest["actual_price"],)
+            break
 
-    print("\n🌐 Fetching historical prices from CoinGecko...")
-    real_prices = fetch_real_prices(days=90)
-    if real_prices:
-        print(f"   Got {len(real_prices)} days of data ({real_prices[0][0]} → {real_prices[-1][0]})")
+    # ── Layout ────────────────────────────────────────────────────────────
+    if new_prices:
+        lo, hi = _y_range(new_prices)
+        y0, y1 = fig.layout.yaxis.range
+        fig.layout.yaxis.range = [min(y0, lo), max(y1, hi)]
+    fig.layout.title.text = _title_text(datetime.date.today())
+    if accuracy_ann:
+        fig.layout.annotations = [accuracy_ann if _is_accuracy_annotation(a) else a
+                                  for a in fig.layout.annotations]
+        menu = fig.layout.updatemenus[0]
+        buttons = [b.to_plotly_json() for b in menu.buttons]
+        for b in buttons:
+            b["args"][0]["annotations"] = [accuracy_ann if _is_accuracy_annotation(a) else a
+                                           for a in b["args"][0]["annotations"]]
+        menu.buttons = buttons
+    return True
+
+
+# ── 4. Write & publish ────────────────────────────────────────────────────────
+
+def write_chart(fig, compact=True, split=True):
+    """
+    Write a go.Figure, or a build_chart(fast=True) dict without re-validating
+    it. `compact` packs the data arrays as binary (see chart_html.py), and
+    `split` keeps only the default 3M view in the page, with older years in
+    OUTPUT_DATA loaded on demand; otherwise plotly's own HTML is written.
+    """
+    if compact:
+        fig_dict = fig if isinstance(fig, dict) else fig.to_dict()
+        if split:
+            chunks = chart_html.write_split(fig_dict, OUTPUT_FILE, OUTPUT_DATA)
+            if chunks:
+                print(f"   History split into {len(chunks)} yearly chunk(s) in {OUTPUT_DATA}")
+        else:
+            chart_html.write_html(fig_dict, OUTPUT_FILE)
+    elif isinstance(fig, dict):
+        pio.write_html(fig, OUTPUT_FILE, include_plotlyjs="cdn", validate=False)
     else:
-        print("   ⚠️  Could not fetch live data — showing digest price points only.")
-
-    print("\n📊 Building chart...")
-    fig = build_chart(digests, real_prices)
-    fig.write_html(OUTPUT_FILE, include_plotlyjs="cdn")
+        fig.write_html(OUTPUT_FILE, include_plotlyjs="cdn")
     print(f"\n✅ Chart saved to: {OUTPUT_FILE}")
 
-    # ── Publish to GitHub Pages ───────────────────────────────────────────
+
+def publish():
+    """Copy the chart into the Pages repo, then commit and push it."""
     import subprocess, shutil
     os.makedirs(os.path.dirname(PAGES_FILE), exist_ok=True)
     shutil.copy(OUTPUT_FILE, PAGES_FILE)
     print(f"   Copied to: {PAGES_FILE}")
+    if os.path.isdir(OUTPUT_DATA):
+        shutil.rmtree(PAGES_DATA, ignore_errors=True)
+        shutil.copytree(OUTPUT_DATA, PAGES_DATA)
 
     result = subprocess.run(
         ["git", "-C", REPO_DIR, "add", "docs/index.html"],
         capture_output=True, text=True
     )
+    # -A so chunks replaced by newer content hashes are removed from the repo too
+    result = subprocess.run(
+        ["git", "-C", REPO_DIR, "add", "-A", f"docs/{DATA_DIRNAME}"],
+        capture_output=True, text=True
+    )
     today_str = datetime.date.today().isoformat()
     result = subprocess.run(
         ["git", "-C", REPO_DIR, "commit", "-m", f"Update Bitcoin chart {today_str}"],
@@ -536,6 +787,146 @@ def main():
         subprocess.run(["git", "-C", REPO_DIR, "push", "origin", "main"])
         print("   Pushed to GitHub Pages ✅")
 
+
+# ── 5. Watch mode ─────────────────────────────────────────────────────────────
+
+def watch(digests, real_prices, fig, debounce=2.0, overlays=None, publish_changes=True,
+          renderer="auto", compact=True, split=True, accuracy=None):
+    """
+    Keep running and update the chart whenever digests land in DIGEST_DIR.
+    Only the new files are parsed; they are appended to the in-memory figure
+    unless they replace an existing day, add a year-end target, or the date
+    has rolled over (then prices are refreshed and the figure is rebuilt).
+    """
+    import digest_watch
+
+    by_date    = {d["date"]: d for d in digests}
+    built_on   = datetime.date.today()
+    print(f"\n👀 Watching {DIGEST_DIR} for new digests (Ctrl-C to stop)...")
+    try:
+        for paths in digest_watch.iter_changes(DIGEST_DIR, debounce=debounce):
+            parsed = digest_cache.cached_parse(
+                paths, parse_digest, DIGEST_DIR,
+                namespace="bitcoin_chart", version=PARSER_VERSION,
+            )
+            fresh = sorted((p for p in parsed if p and p["actual_price"]), key=lambda p: p["date"])
+            if not fresh:
+                continue
+            for d in fresh:
+                print(f"   • {d['file']}  price: ${d['actual_price']:,.0f}")
+
+            rebuild = datetime.date.today() != built_on
+            latest  = max(by_date)
+            for d in fresh:
+                if d["date"] in by_date or d["date"] < latest:
+                    rebuild = True
+                by_date[d["date"]] = d
+            digests = [by_date[k] for k in sorted(by_date)]
+
+            if _HAS_NUMPY:
+                digest_store.DigestStore(DIGEST_DIR).update(fresh)
+                accuracy = backtest.from_store(DIGEST_DIR)
+
+            if not rebuild:
+                for d in fresh:
+                    if not extend_chart(fig, d, accuracy):
+                        rebuild = True
+                        break
+            if rebuild:
+                if datetime.date.today() != built_on:
+                    real_prices = fetch_real_prices() or real_prices
+                    built_on = datetime.date.today()
+                fig = build_chart(digests, real_prices, overlays, renderer, accuracy=accuracy)
+
+            write_chart(fig, compact, split)
+            if publish_changes:
+                publish()
+    except KeyboardInterrupt:
+        print("\n   Stopped watching.")
+
+
+# ── 6. Main ───────────────────────────────────────────────────────────────────
+
+def main():
+    parser = argparse.ArgumentParser(description="Bitcoin forecast vs. actual price chart")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="parse digests with N processes (0 = all cores)")
+    parser.add_argument("--watch", action="store_true",
+                        help="keep running and update the chart when new digests arrive")
+    parser.add_argument("--assets", default="bitcoin",
+                        help="comma-separated CoinGecko ids to overlay, e.g. bitcoin,ethereum")
+    parser.add_argument("--currencies", default="usd",
+                        help="comma-separated quote currencies for the overlays, e.g. usd,nzd,cny")
+    parser.add_argument("--renderer", choices=("auto", "svg", "webgl"), default="auto",
+                        help=f"draw with SVG or WebGL (auto: WebGL above {WEBGL_POINT_THRESHOLD} points)")
+    parser.add_argument("--plain-html", action="store_true",
+                        help="write plotly's standard HTML instead of the compact binary-encoded page")
+    parser.add_argument("--single-file", action="store_true",
+                        help="embed the whole history in the page instead of loading older years on demand")
+    parser.add_argument("--no-publish", action="store_true",
+                        help="only write the local chart (no git push, no browser) — for test runs")
+    args = parser.parse_args()
+    assets     = [a.strip().lower() for a in args.assets.split(",") if a.strip()]
+    currencies = [c.strip().lower() for c in args.currencies.split(",") if c.strip()]
+
+    print("📂 Reading digest files...")
+    digests = load_digests(workers=args.workers)
+    if not digests:
+        print("❌ No digest files found. Run /bitcoin first to generate them.")
+        return
+
+    print(f"   Found {len(digests)} digest(s):")
+    for d in digests:
+        print(f"   • {d['date']}  price: ${d['actual_price']:,.0f}  forecasts: {d['forecasts']}")
+    dialects = Counter(d.get("dialect", "generic") for d in digests)
+    print("   Dialects: " + ", ".join(f"{k} ×{v}" for k, v in dialects.most_common()))
+
+    # Keep the memory-mapped column store (long-horizon analysis) in sync
+    if _HAS_NUMPY:
+        added = digest_store.DigestStore(DIGEST_DIR).update(digests)
+        if added:
+            print(f"   Column store: +{added} row(s)")
+
+    print("\n🌐 Loading price history (local store, synced from CoinGecko)...")
+    real_prices = fetch_real_prices()
+    if real_prices:
+        print(f"   Got {len(real_prices)} price points "
+              f"({real_prices[0][0]:%Y-%m-%d} → {real_prices[-1][0]:%Y-%m-%d %H:%M} UTC)")
+    else:
+        print("   ⚠️  Could not fetch live data — showing digest price points only.")
+
+    overlays = None
+    if (assets, currencies) != (["bitcoin"], ["usd"]):
+        print(f"   Fetching overlays: {', '.join(assets)} in {', '.join(c.upper() for c in currencies)}...")
+        overlays = price_store.fetch_many(DIGEST_DIR, assets, currencies, days=90)
+        print(f"   Got {len(overlays[1])} overlay series over {len(overlays[0])} common day(s)")
+
+    accuracy = None
+    if _HAS_NUMPY:
+        accuracy = backtest.from_store(DIGEST_DIR)
+        for key, r in accuracy.items():
+            if r.get("n"):
+                print(f"   {key} forecasts: {r['hit_rate']:.0%} in range over {r['n']} matured")
+
+    print("\n📊 Building chart...")
+    # extend_chart (watch mode) appends to a go.Figure; one-shot runs skip validation
+    fig = build_chart(digests, real_prices, overlays, args.renderer, fast=not args.watch,
+                      accuracy=accuracy)
+    write_chart(fig, compact=not args.plain_html, split=not args.single_file)
+
+    # ── Publish to GitHub Pages ───────────────────────────────────────────
+    if not args.no_publish:
+        publish()
+
+    if args.watch:
+        watch(digests, real_prices, fig, overlays=overlays, publish_changes=not args.no_publish,
+              renderer=args.renderer, compact=not args.plain_html, split=not args.single_file,
+              accuracy=accuracy)
+        return
+    if args.no_publish:
+        return
+
+    import subprocess
     print("\n   Opening in browser...")
     subprocess.run(["open", OUTPUT_FILE])
 
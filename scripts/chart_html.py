@@ -0,0 +1,447 @@
+"""
+Compact Chart HTML
+Writes a Plotly figure dict as a standalone page whose data arrays are
+binary instead of JSON text:
+
+  - dates become epoch-day integers (epoch-minutes when the series has
+    intraday times), prices on the main axis are rounded to whole dollars,
+    and every array is packed into the smallest typed array that holds it
+    exactly (u2 / i4, f4 for the % overlays), base64-encoded
+  - identical arrays (the price line and its fill baseline share their
+    dates) are stored once and referenced by index
+  - a few lines of JS expand the arrays into typed arrays (dates into
+    milliseconds, which a date axis takes as-is) before Plotly.newPlot
+
+None values (the gaps between concatenated band polygons) are stored as
+the integer type's largest value and decoded to NaN, which Plotly treats
+the same way. Everything else in the figure — layout, template, hover
+templates — is written as ordinary JSON.
+
+write_split() goes further and keeps only the default view in the page:
+older points go into one small script per year, which the page loads when
+"All" is picked or the view is panned past what it holds. Chunks are
+scripts (each calls chartChunk()) rather than JSON for fetch(), so they
+also load when the page is opened from disk.
+"""
+
+import os
+import sys
+import json
+import math
+import array
+import base64
+import hashlib
+import datetime
+
+from plotly.offline import get_plotlyjs, get_plotlyjs_version
+
+PLOTLYJS_CDN = f"https://cdn.plot.ly/plotly-{get_plotlyjs_version()}.min.js"
+
+_EPOCH = datetime.datetime(1970, 1, 1)
+_UNIT_SECONDS = {"day": 86400, "min": 60}
+
+
+# ── 1. Encoding ───────────────────────────────────────────────────────────────
+
+def _pack(values, dtype, gap=None):
+    """base64 of `values` as a little-endian typed array, with None stored as `gap` (or NaN)."""
+    code = {"u2": "H", "i4": "i", "f4": "f", "f8": "d"}[dtype]
+    fill = math.nan if gap is None else gap
+    buf = array.array(code, [fill if v is None else v for v in values])
+    if sys.byteorder == "big":
+        buf.byteswap()
+    return base64.b64encode(buf.tobytes()).decode("ascii")
+
+
+def _encode_ints(ints, **extra):
+    """
+    Pack ints (None = gap) into the smallest exact dtype. Integer dtypes
+    reserve their largest value as the gap marker, passed on as "gap".
+    """
+    present = [v for v in ints if v is not None]
+    has_gaps = len(present) < len(ints)
+    top = 2 ** 16 - 1 if has_gaps else 2 ** 16
+    if all(0 <= v < top for v in present):
+        dtype, gap = "u2", 2 ** 16 - 1
+    elif all(-2 ** 31 <= v < 2 ** 31 - has_gaps for v in present):
+        dtype, gap = "i4", 2 ** 31 - 1
+    else:
+        dtype, gap = "f8", None
+    encoded = {"dtype": dtype, "bdata": _pack(ints, dtype, gap if has_gaps else None), **extra}
+    if has_gaps and gap is not None:
+        encoded["gap"] = gap
+    return encoded
+
+
+def _as_epoch(x):
+    if isinstance(x, datetime.datetime):
+        return (x.replace(tzinfo=None) - _EPOCH).total_seconds()
+    return (x - _EPOCH.date()).days * 86400.0
+
+
+def _is_dates(values):
+    present = [v for v in values if v is not None]
+    return bool(present) and all(isinstance(v, datetime.date) for v in present)
+
+
+def encode_dates(values):
+    """{"dtype", "bdata", "unit"} for a list of dates / datetimes / None, or None if not one."""
+    if not _is_dates(values):
+        return None
+    seconds = [None if v is None else _as_epoch(v) for v in values]
+    unit = "day" if all(s % 86400 == 0 for s in seconds if s is not None) else "min"
+    ints = [None if s is None else int(round(s / _UNIT_SECONDS[unit])) for s in seconds]
+    return _encode_ints(ints, unit=unit)
+
+
+def encode_numbers(values, whole=False):
+    """{"dtype", "bdata"} for a list of numbers / None (rounded to ints if `whole`), or None."""
+    present = [v for v in values if v is not None]
+    if not present or not all(isinstance(v, (int, float)) and not isinstance(v, bool) for v in present):
+        return None
+    if whole:
+        return _encode_ints([None if v is None else int(round(v)) for v in values])
+    return {"dtype": "f4", "bdata": _pack(values, "f4")}
+
+
+class _ArrayTable:
+    """Encoded arrays for one page or chunk, each stored once and referenced by index."""
+
+    def __init__(self):
+        self.arrays = []
+        self._seen  = {}
+
+    def ref(self, encoded):
+        key = (encoded["dtype"], encoded.get("unit"), encoded["bdata"])
+        if key not in self._seen:
+            self._seen[key] = len(self.arrays)
+            self.arrays.append(encoded)
+        return {"ref": self._seen[key]}
+
+    def encode(self, trace):
+        """Copy of `trace` with encodable x / y arrays replaced by refs, and whether x held dates."""
+        trace = dict(trace)
+        x, y = trace.get("x"), trace.get("y")
+        has_dates = False
+        if isinstance(x, (list, tuple)):
+            encoded = encode_dates(x)
+            if encoded:
+                trace["x"] = self.ref(encoded)
+                has_dates = True
+        if isinstance(y, (list, tuple)):
+            # Main-axis values are prices: whole dollars are exact enough
+            encoded = encode_numbers(y, whole=trace.get("yaxis", "y") == "y")
+            if encoded:
+                trace["y"] = self.ref(encoded)
+        return trace, has_dates
+
+
+def compact_figure(fig):
+    """
+    Copy of figure dict `fig` with its trace x/y arrays moved into a shared
+    "arrays" table of encoded typed arrays; traces hold {"ref": i} instead.
+    """
+    table, data, has_dates = _ArrayTable(), [], False
+    for trace in fig["data"]:
+        trace, dated = table.encode(trace)
+        data.append(trace)
+        has_dates = has_dates or dated
+
+    layout = dict(fig.get("layout", {}))
+    if has_dates:
+        # Numeric x would otherwise be autotyped as a linear axis
+        layout["xaxis"] = {**layout.get("xaxis", {}), "type": "date"}
+    return {"data": data, "layout": layout, "arrays": table.arrays}
+
+
+# ── 2. Splitting off history ──────────────────────────────────────────────────
+# The shell page keeps only what the default view needs: points from the
+# x-axis range start on (plus the one before it, so lines enter from the left
+# edge) and every band polygon that reaches into the view. Everything older
+# goes into one chunk per year, loaded when the view moves past it.
+
+_POINT_KEYS = ("x", "y", "customdata")
+
+
+def _segments(xs):
+    """(start, end) index ranges of the None-separated runs in xs, each with its trailing None."""
+    out, start = [], 0
+    for i, x in enumerate(xs):
+        if x is None:
+            out.append((start, i + 1))
+            start = i + 1
+    if start < len(xs):
+        out.append((start, len(xs)))
+    return out
+
+
+def _segment_ends(xs):
+    return [max((_as_epoch(x) for x in xs[a:b] if x is not None), default=-math.inf)
+            for a, b in _segments(xs)]
+
+
+def _split_trace(trace, cutoff, ends=None):
+    """
+    (shell index ranges, {year: history index ranges}) for one trace's
+    points. A None-separated trace is split by polygon: a polygon stays in
+    the shell if it reaches `cutoff`, else it is filed under the year it
+    ends in (so it loads with the days it covers). `ends` overrides each
+    polygon's end, to keep polygons of sibling traces together.
+    """
+    xs = trace["x"]
+    if None in xs:
+        shell, history = [], {}
+        for (a, b), end in zip(_segments(xs), ends or _segment_ends(xs)):
+            if end >= cutoff:
+                shell.append((a, b))
+            else:
+                year = (_EPOCH + datetime.timedelta(seconds=end)).year
+                history.setdefault(year, []).append((a, b))
+        return shell, history
+
+    first = next((i for i, x in enumerate(xs) if _as_epoch(x) >= cutoff), len(xs))
+    keep = max(first - 1, 0)
+    history = {}
+    for i in range(keep):
+        year = xs[i].year
+        if history.get(year) and history[year][-1][1] == i:
+            history[year][-1] = (history[year][-1][0], i + 1)
+        else:
+            history.setdefault(year, []).append((i, i + 1))
+    return [(keep, len(xs))], history
+
+
+def _take(trace, ranges):
+    """The per-point arrays of `trace` restricted to the index ranges."""
+    n = len(trace["x"])
+    return {k: [v for a, b in ranges for v in trace[k][a:b]]
+            for k in _POINT_KEYS if isinstance(trace.get(k), (list, tuple)) and len(trace[k]) == n}
+
+
+def split_figure(fig, cutoff):
+    """
+    (shell figure dict, {year: [(trace index, yaxis, arrays)]}) for figure dict
+    `fig`, keeping points from `cutoff` (a date) on in the shell. Traces
+    whose x is not a date series stay whole in the shell.
+    """
+    cutoff = _as_epoch(cutoff)
+    dated  = [isinstance(t.get("x"), (list, tuple)) and _is_dates(t["x"]) for t in fig["data"]]
+
+    # Polygon traces sharing a legendgroup and polygon count (a band's slices,
+    # edge and hover outline) are split as one, using each polygon's latest end
+    group_ends = {}
+    for trace, ok in zip(fig["data"], dated):
+        if ok and None in trace["x"]:
+            ends = _segment_ends(trace["x"])
+            key  = (trace.get("legendgroup"), len(ends))
+            prev = group_ends.get(key, ends)
+            group_ends[key] = [max(a, b) for a, b in zip(prev, ends)]
+
+    data, chunks = [], {}
+    for i, (trace, ok) in enumerate(zip(fig["data"], dated)):
+        if not ok:
+            data.append(trace)
+            continue
+        ends = None
+        if None in trace["x"]:
+            ends = group_ends[(trace.get("legendgroup"), len(_segments(trace["x"])))]
+        shell, history = _split_trace(trace, cutoff, ends)
+        data.append({**trace, **_take(trace, shell)})
+        for year, ranges in history.items():
+            chunks.setdefault(year, []).append((i, trace.get("yaxis", "y"), _take(trace, ranges)))
+    return {**fig, "data": data}, chunks
+
+
+def _x_extent(fig):
+    xs = [x for t in fig["data"] if isinstance(t.get("x"), (list, tuple))
+          for x in t["x"] if isinstance(x, datetime.date)]
+    return (min(xs, key=_as_epoch), max(xs, key=_as_epoch)) if xs else (None, None)
+
+
+def compact_chunk(traces):
+    """Encoded form of one year's [(trace index, yaxis, arrays)]."""
+    table = _ArrayTable()
+    out = []
+    for index, yaxis, arrays in traces:
+        encoded, _ = table.encode({**arrays, "yaxis": yaxis})
+        del encoded["yaxis"]
+        out.append({"index": index, **encoded})
+    return {"arrays": table.arrays, "traces": out}
+
+
+# ── 3. Page ───────────────────────────────────────────────────────────────────
+
+_DECODER_JS = """
+(function () {
+  var TYPES = {u2: Uint16Array, i4: Int32Array, f4: Float32Array, f8: Float64Array};
+  var UNIT_MS = {day: 86400000, min: 60000};
+  function decode(a) {
+    var bin = atob(a.bdata), bytes = new Uint8Array(bin.length);
+    for (var i = 0; i < bin.length; i++) bytes[i] = bin.charCodeAt(i);
+    var values = new TYPES[a.dtype](bytes.buffer);
+    if (!a.unit && a.gap === undefined) return values;
+    var out = new Float64Array(values.length), k = a.unit ? UNIT_MS[a.unit] : 1;
+    for (var j = 0; j < values.length; j++) out[j] = values[j] === a.gap ? NaN : values[j] * k;
+    return out;
+  }
+  function resolve(value, arrays) {
+    return value && value.ref !== undefined ? arrays[value.ref] : value;
+  }
+  function concat(older, newer) {
+    if (Array.isArray(newer) || Array.isArray(older)) return Array.from(older).concat(Array.from(newer));
+    var out = new Float64Array(older.length + newer.length);
+    out.set(older);
+    out.set(newer, older.length);
+    return out;
+  }
+
+  var fig = JSON.parse(document.getElementById("chart-data").textContent);
+  var arrays = fig.arrays.map(decode);
+  fig.data.forEach(function (trace) {
+    ["x", "y"].forEach(function (key) { trace[key] = resolve(trace[key], arrays); });
+  });
+  var gd = document.getElementById("chart");
+  Plotly.newPlot(gd, fig.data, fig.layout, {responsive: true});
+  if (!fig.chunks) return;
+
+  // Older history: one script per year, newest first, each calling chartChunk()
+  var pending = fig.chunks.files.slice(), loadedFrom = fig.chunks.loadedFrom;
+  var waiting = {}, queue = Promise.resolve();
+  window.chartChunk = function (key, chunk) { if (waiting[key]) waiting[key](chunk); };
+  function load(file) {
+    return new Promise(function (done, fail) {
+      waiting[file.key] = done;
+      var s = document.createElement("script");
+      s.src = file.src;
+      s.onerror = fail;
+      document.head.appendChild(s);
+    });
+  }
+  function prepend(chunks) {
+    var data = gd.data.map(function (t) { return Object.assign({}, t); });
+    chunks.forEach(function (chunk) {
+      var arrays = chunk.arrays.map(decode);
+      chunk.traces.forEach(function (c) {
+        ["x", "y", "customdata"].forEach(function (key) {
+          if (c[key] !== undefined) data[c.index][key] = concat(resolve(c[key], arrays), data[c.index][key] || []);
+        });
+      });
+    });
+    return Plotly.react(gd, data, gd.layout);
+  }
+  function ensure(fromMs) {
+    var need = [];
+    while (pending.length && (fromMs === null || fromMs < loadedFrom)) {
+      need.push(pending[0]);
+      loadedFrom = pending.shift().from;
+    }
+    if (!need.length) return;
+    queue = queue.then(function () { return Promise.all(need.map(load)); }).then(prepend)
+      .catch(function () { console.warn("Could not load older chart history"); });
+  }
+  function toMs(v) {
+    if (typeof v === "number") return v;
+    var s = String(v).replace(" ", "T");
+    return Date.parse(s.length <= 10 ? s + "T00:00Z" : s + "Z");
+  }
+  gd.on("plotly_relayout", function (ev) {
+    if (ev["xaxis.autorange"]) return ensure(null);
+    var start = ev["xaxis.range[0]"] !== undefined ? ev["xaxis.range[0]"] : (ev["xaxis.range"] || [])[0];
+    if (start !== undefined) ensure(toMs(start));
+  });
+})();
+"""
+
+
+def _sri(script):
+    return "sha256-" + base64.b64encode(hashlib.sha256(script.encode("utf-8")).digest()).decode()
+
+
+_plotlyjs_sri = None
+
+
+def plotlyjs_tag():
+    """<script> for the plotly.js build bundled with the installed plotly (pinned + SRI)."""
+    global _plotlyjs_sri
+    if _plotlyjs_sri is None:
+        _plotlyjs_sri = _sri(get_plotlyjs())
+    return (f'<script charset="utf-8" src="{PLOTLYJS_CDN}" integrity="{_plotlyjs_sri}" '
+            f'crossorigin="anonymous"></script>')
+
+
+def _json_for_script(obj):
+    """JSON safe to embed in a <script> element."""
+    return (json.dumps(obj, separators=(",", ":"), default=_json_default)
+            .replace("</", "<\\/"))
+
+
+def _json_default(obj):
+    if isinstance(obj, (datetime.date, datetime.datetime)):
+        return obj.isoformat()
+    raise TypeError(f"{type(obj).__name__} is not JSON serialisable")
+
+
+def _page(payload, height):
+    style = f"height:{height}px; width:100%;" if height else "height:100%; width:100%;"
+    return (
+        "<html>\n<head><meta charset=\"utf-8\" /></head>\n<body>\n"
+        f"  {plotlyjs_tag()}\n"
+        f'  <div id="chart" class="plotly-graph-div" style="{style}"></div>\n'
+        f'  <script type="application/json" id="chart-data">{_json_for_script(payload)}</script>\n'
+        f"  <script>{_DECODER_JS}</script>\n"
+        "</body>\n</html>\n"
+    )
+
+
+def to_html(fig):
+    """Standalone compact HTML page for figure dict `fig`."""
+    return _page(compact_figure(fig), fig.get("layout", {}).get("height"))
+
+
+def write_html(fig, path):
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(to_html(fig))
+
+
+def write_split(fig, path, data_dir):
+    """
+    Write figure dict `fig` as a shell page at `path` holding the default
+    view (from the x-axis range start on) plus one script per older year in
+    `data_dir`, fetched by the page when the view moves past what it has.
+    Chunk names carry a content hash, so browsers never mix stale years in;
+    chunks no longer referenced are removed. Without a range start or any
+    older history, this is a single write_html page.
+    Returns the chunk paths, relative to the page.
+    """
+    layout = fig.get("layout", {})
+    start  = (layout.get("xaxis", {}).get("range") or [None])[0]
+    shell, chunks = split_figure(fig, datetime.date.fromisoformat(start[:10])) if start else (fig, {})
+
+    if chunks:
+        os.makedirs(data_dir, exist_ok=True)
+    files = []
+    for year in sorted(chunks, reverse=True):
+        body = _json_for_script(compact_chunk(chunks[year]))
+        key  = f"{year}-{hashlib.sha1(body.encode()).hexdigest()[:10]}"
+        name = key + ".js"
+        with open(os.path.join(data_dir, name), "w", encoding="utf-8") as f:
+            f.write(f'chartChunk("{key}", {body});\n')
+        files.append({"key": key, "src": f"{os.path.basename(data_dir)}/{name}",
+                      "from": int(_as_epoch(datetime.date(year, 1, 1)) * 1000)})
+    current = {f["key"] + ".js" for f in files}
+    for name in os.listdir(data_dir) if os.path.isdir(data_dir) else []:
+        if name.endswith(".js") and name not in current:
+            os.remove(os.path.join(data_dir, name))
+
+    payload = compact_figure(shell)
+    if files:
+        payload["chunks"] = {"files": files,
+                             "loadedFrom": int(_as_epoch(datetime.date.fromisoformat(start[:10])) * 1000)}
+        # Let the range slider span the whole archive, so it can pull history in
+        first, last = _x_extent(fig)
+        xaxis = payload["layout"]["xaxis"]
+        xaxis["rangeslider"] = {**xaxis.get("rangeslider", {}),
+                                "autorange": False, "range": [str(first), str(last)]}
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(_page(payload, layout.get("height")))
+    return [f["src"] for f in files]
@@ -0,0 +1,107 @@
+"""
+Digest Store Writer Check
+bitcoin_chart.py and bitcoin_weekly_slides.py both update the shared column
+store (digest_store.py) with their own parse_digest output. This writes a
+synthetic corpus (digest_synth.py, plus a few single-target forecasts), runs
+both writers in either order — the chart over the whole archive, the slides
+over the last 14 days as in a real run — and exits non-zero unless every
+order leaves byte-for-byte the same columns as the chart writing alone.
+
+Usage:
+  python scripts/check_digest_store.py [-n 120]
+"""
+
+import os
+import sys
+import shutil
+import argparse
+import datetime
+import tempfile
+
+import numpy as np
+
+import digest_store
+import digest_synth
+import bitcoin_chart
+import bitcoin_weekly_slides
+
+SINGLE_TARGET_DIGEST = """# 比特币每日摘要 — {date}
+
+| 指标 | 数值 |
+|---|---|
+| 当前价格 | **${price:,.0f}** |
+
+## 🔮 价格预测
+
+- **1周**：${w:,.0f}
+- **1个月**：${m:,.0f}
+- 年底2026主流：$150,000
+"""
+
+
+def write_corpus(out_dir, n):
+    """digest_synth corpus whose last few days use single-price forecasts."""
+    manifest = digest_synth.write_corpus(out_dir, n)
+    for item in manifest[-10::3]:
+        price = item["price"]
+        with open(item["path"], "w", encoding="utf-8") as f:
+            f.write(SINGLE_TARGET_DIGEST.format(date=item["date"], price=price,
+                                                w=price * 1.02, m=price * 1.05))
+    return [item["path"] for item in manifest]
+
+
+def build_store(store_dir, paths, order):
+    """Fill a fresh store in `store_dir` by running the writers named in `order`."""
+    shutil.rmtree(store_dir, ignore_errors=True)
+    os.makedirs(store_dir)
+    cutoff = datetime.date.today() - datetime.timedelta(days=14)
+    for writer in order:
+        if writer == "chart":
+            digests = [bitcoin_chart.parse_digest(p) for p in paths]
+        else:
+            digests = [bitcoin_weekly_slides.parse_digest(p) for p in paths]
+            digests = [d for d in digests if d and d["date"] >= cutoff]
+        digest_store.DigestStore(store_dir).update(digests)
+    return {k: np.array(v) for k, v in digest_store.DigestStore(store_dir).columns().items()}
+
+
+def differences(a, b):
+    """Names of the columns that differ between two column dicts."""
+    out = []
+    for name in digest_store.COLUMNS:
+        if a[name].dtype.kind == "f":
+            same = np.array_equal(a[name], b[name], equal_nan=True)
+        else:
+            same = np.array_equal(a[name], b[name])
+        if not same:
+            out.append(name)
+    return out
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check both digest-store writers agree")
+    parser.add_argument("-n", type=int, default=120, help="number of synthetic digests (default 120)")
+    args = parser.parse_args()
+
+    tmp = tempfile.mkdtemp(prefix="digest-store-check-")
+    try:
+        paths = write_corpus(os.path.join(tmp, "digests"), args.n)
+        reference = build_store(os.path.join(tmp, "store"), paths, ["chart"])
+        failures = 0
+        for order in (["weekly", "chart"], ["chart", "weekly"], ["chart", "weekly", "chart"]):
+            diff = differences(reference, build_store(os.path.join(tmp, "store"), paths, order))
+            failures += bool(diff)
+            label = " → ".join(order)
+            print(f"   {'❌' if diff else '✅'} {label:<24} {', '.join(diff) if diff else 'same store'}")
+    finally:
+        shutil.rmtree(tmp, ignore_errors=True)
+
+    if failures:
+        print(f"\n❌ {failures} writer order(s) left a different store")
+        return 1
+    print("\n✅ Both writers leave the same store in any order")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
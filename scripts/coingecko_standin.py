@@ -0,0 +1,228 @@
+"""
+CoinGecko Stand-in Server
+Local HTTP server that answers /api/v3/coins/{id}/market_chart the way
+CoinGecko does, so the bitcoin scripts can be load-tested and benchmarked
+without the live API.
+
+Prices come from recorded fixtures (MARKET_DATA_MODE=record, see
+market_data.py) when one matches the request, otherwise from a synthetic
+random walk seeded by asset and currency — the same request always gets
+the same answer. Latency and failures can be injected:
+
+  --latency 0.3        seconds added to every response (plus ±--jitter)
+  --error-rate 0.2     fraction of requests answered with 429 (Retry-After)
+                       or 503, alternating
+
+Responses carry an ETag, and If-None-Match gets a 304, like the real API.
+
+Usage:
+  python scripts/coingecko_standin.py [--port 8765] [--latency 0.3] [--error-rate 0.1]
+                                      [--fixtures DIR] [--seed 0]
+  export COINGECKO_API_BASE=http://127.0.0.1:8765/api/v3
+  python scripts/bitcoin_chart.py --no-publish
+"""
+
+import re
+import json
+import time
+import random
+import hashlib
+import argparse
+import datetime
+import threading
+import urllib.parse
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+import market_data
+
+_ROUTE = re.compile(r"^/api/v3/coins/([\w-]+)/market_chart$")
+
+# Rough starting levels for the synthetic walk (USD) and quote-currency rates
+BASE_PRICES = {"bitcoin": 60000.0, "ethereum": 3000.0, "solana": 150.0,
+               "ripple": 0.6, "binancecoin": 550.0, "cardano": 0.45}
+FX_RATES    = {"usd": 1.0, "nzd": 1.65, "cny": 7.2, "eur": 0.92, "gbp": 0.79, "jpy": 150.0}
+
+# First day of the walk — CoinGecko's bitcoin history starts here too
+WALK_START = datetime.date(2013, 4, 28)
+
+
+# ── 1. Data ───────────────────────────────────────────────────────────────────
+
+def _daily_walk(asset, currency, seed, today):
+    """{date: price} from WALK_START to `today` — a function of its arguments only."""
+    epoch = WALK_START
+    level = BASE_PRICES.get(asset, 100.0) * FX_RATES.get(currency, 1.0)
+    rng   = random.Random(f"{asset}/{currency}/{seed}")
+    walk  = {}
+    for i in range((today - epoch).days + 2):
+        level *= 1 + rng.gauss(0.0005, 0.03)
+        walk[epoch + datetime.timedelta(days=i)] = level
+    return walk
+
+
+def synthetic_prices(asset, currency, days, seed=0, now=None, interval="daily"):
+    """
+    [[ts_ms, price], ...] shaped like CoinGecko's market_chart. With
+    interval="daily": one point per UTC midnight for `days` days plus the
+    live point at `now`. Otherwise CoinGecko's automatic granularity —
+    5-minutely for 1 day, hourly up to 90 days, daily beyond — with the
+    intraday points wandering between consecutive daily levels.
+    The series only depends on (asset, currency, seed), so overlapping
+    windows requested at different times agree.
+    """
+    now   = now or datetime.datetime.now(datetime.timezone.utc)
+    today = now.date()
+    walk  = _daily_walk(asset, currency, seed, today)
+    now_s = int(now.timestamp())
+
+    if interval != "daily" and days <= 90:
+        step  = 300 if days <= 1 else 3600
+        first = (now_s - days * 86400) // step * step + step
+        out = []
+        for ts in range(first, now_s + 1, step):
+            d    = datetime.datetime.fromtimestamp(ts, datetime.timezone.utc)
+            frac = (d.hour * 3600 + d.minute * 60 + d.second) / 86400
+            base = walk[d.date()] * (1 - frac) + walk[d.date() + datetime.timedelta(days=1)] * frac
+            noise = random.Random(f"{asset}/{currency}/{seed}/{ts}").gauss(0, 0.003)
+            out.append([ts * 1000, round(base * (1 + noise), 2)])
+        return out
+
+    out = []
+    for i in range(days, -1, -1):
+        d  = today - datetime.timedelta(days=i)
+        ts = int(datetime.datetime(d.year, d.month, d.day, tzinfo=datetime.timezone.utc).timestamp())
+        out.append([ts * 1000, round(walk[d], 2)])
+    frac = (now_s % 86400) / 86400
+    live = walk[today] * (1 - frac) + walk[today + datetime.timedelta(days=1)] * frac
+    out.append([now_s * 1000, round(live, 2)])
+    return out
+
+
+# ── 2. Server ─────────────────────────────────────────────────────────────────
+
+class StandIn(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address, latency=0.0, jitter=0.0, error_rate=0.0,
+                 fixtures_dir=None, seed=0):
+        super().__init__(address, _Handler)
+        self.latency      = latency
+        self.jitter       = jitter
+        self.error_rate   = error_rate
+        self.fixtures_dir = fixtures_dir
+        self.seed         = seed
+        self.requests     = 0
+        self._rng         = random.Random(seed)
+        self._lock        = threading.Lock()
+
+    def next_fault(self):
+        """None, 429 or 503 for the next request, per --error-rate."""
+        with self._lock:
+            self.requests += 1
+            if self._rng.random() >= self.error_rate:
+                return None
+            return 429 if self.requests % 2 else 503
+
+    def delay(self):
+        with self._lock:
+            extra = self._rng.uniform(-self.jitter, self.jitter) if self.jitter else 0.0
+        return max(0.0, self.latency + extra)
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, fmt, *args):
+        pass
+
+    def _send(self, status, body=b"", headers=None):
+        self.send_response(status)
+        for k, v in (headers or {}).items():
+            self.send_header(k, v)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        if body:
+            self.wfile.write(body)
+
+    def do_GET(self):
+        url = urllib.parse.urlsplit(self.path)
+        m = _ROUTE.match(url.path)
+        if not m:
+            self._send(404, b'{"error":"not found"}', {"Content-Type": "application/json"})
+            return
+
+        time.sleep(self.server.delay())
+        fault = self.server.next_fault()
+        if fault == 429:
+            self._send(429, b'{"status":{"error_code":429}}', {"Retry-After": "1"})
+            return
+        if fault == 503:
+            self._send(503, b"Service Unavailable")
+            return
+
+        params = dict(urllib.parse.parse_qsl(url.query))
+        try:
+            days = int(params.get("days", 1))
+        except ValueError:
+            self._send(400, b'{"error":"invalid days"}', {"Content-Type": "application/json"})
+            return
+
+        body = None
+        if self.server.fixtures_dir:
+            path = market_data.fixture_path(url.path, params, self.server.fixtures_dir)
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    body = json.load(f)["body"]
+            except (OSError, ValueError, KeyError):
+                pass
+        if body is None:
+            prices = synthetic_prices(m.group(1), params.get("vs_currency", "usd"), days,
+                                      seed=self.server.seed, interval=params.get("interval"))
+            body = {"prices": prices, "market_caps": [], "total_volumes": []}
+
+        payload = json.dumps(body, separators=(",", ":")).encode()
+        etag = '"' + hashlib.sha1(payload).hexdigest()[:20] + '"'
+        if self.headers.get("If-None-Match") == etag:
+            self._send(304, headers={"ETag": etag})
+            return
+        self._send(200, payload, {"Content-Type": "application/json", "ETag": etag,
+                                  "Cache-Control": "public, max-age=30"})
+
+
+def serve(port=8765, host="127.0.0.1", **options):
+    """Start a stand-in on a background thread and return it (port 0 = any free port)."""
+    server = StandIn((host, port), **options)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def api_base(server):
+    host, port = server.server_address[:2]
+    return f"http://{host}:{port}/api/v3"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Local CoinGecko market_chart stand-in")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds added to each response")
+    parser.add_argument("--jitter", type=float, default=0.0, help="± seconds of random extra latency")
+    parser.add_argument("--error-rate", type=float, default=0.0,
+                        help="fraction of requests answered with 429/503 (0–1)")
+    parser.add_argument("--fixtures", help="serve recorded market_data fixtures from this directory")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    server = StandIn((args.host, args.port), latency=args.latency, jitter=args.jitter,
+                     error_rate=args.error_rate, fixtures_dir=args.fixtures, seed=args.seed)
+    print(f"🧪 CoinGecko stand-in on {api_base(server)}  "
+          f"(latency {args.latency:g}s, errors {args.error_rate:.0%})")
+    print(f"   export COINGECKO_API_BASE={api_base(server)}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print(f"\n   Stopped after {server.requests} request(s).")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,234 @@
+"""
+Digest Parse Cache
+Persistent JSON index of parsed digest files, stored next to the digests —
+one file per namespace (.digest-cache.<namespace>.json), so a script only
+ever loads the entries for its own parser.
+
+Each entry is keyed on the digest's file name and validated against its
+mtime, size and content hash, so a run only re-parses files that are new
+or have changed and loads everything else straight from the index.
+"""
+
+import os
+import json
+import signal
+import hashlib
+import datetime
+import functools
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+CACHE_NAME    = ".digest-cache.{namespace}.json"
+CACHE_VERSION = 2
+
+# Shared index written by CACHE_VERSION 1; removed on the first save
+LEGACY_CACHE_NAME = ".digest-cache.json"
+
+# Below this many files a process pool costs more to start than it saves
+PARALLEL_MIN_FILES = 64
+
+# Wall-clock seconds one file may take to parse before it is recorded and skipped
+PARSE_BUDGET = 2.0
+
+
+# ── 1. Index file ─────────────────────────────────────────────────────────────
+
+def _cache_path(digest_dir, namespace):
+    return os.path.join(digest_dir, CACHE_NAME.format(namespace=namespace))
+
+
+def load_index(digest_dir, namespace, version):
+    """
+    Load one namespace's index, or return an empty one if it is missing,
+    unreadable or was written for another parser `version`.
+    """
+    empty = {"version": CACHE_VERSION, "parser_version": version, "entries": {}}
+    try:
+        with open(_cache_path(digest_dir, namespace), "r", encoding="utf-8") as f:
+            index = json.load(f)
+    except (OSError, ValueError):
+        return empty
+    if index.get("version") != CACHE_VERSION or index.get("parser_version") != version:
+        return empty
+    return index
+
+
+def save_index(digest_dir, namespace, index):
+    """Write the index atomically so a crashed run never leaves half a file."""
+    path = _cache_path(digest_dir, namespace)
+    tmp  = path + ".tmp"
+    try:
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(index, f, ensure_ascii=False, separators=(",", ":"))
+        os.replace(tmp, path)
+    except OSError as e:
+        print(f"   ⚠️  Could not write digest cache — {e}")
+        return
+    try:
+        os.remove(os.path.join(digest_dir, LEGACY_CACHE_NAME))
+    except OSError:
+        pass
+
+
+# ── 2. (De)serialising parsed digests ─────────────────────────────────────────
+
+def _encode(parsed):
+    if parsed is None:
+        return None
+    out = dict(parsed)
+    if isinstance(out.get("date"), datetime.date):
+        out["date"] = out["date"].isoformat()
+    return out
+
+
+def _decode(stored):
+    if stored is None:
+        return None
+    out = dict(stored)
+    if isinstance(out.get("date"), str):
+        out["date"] = datetime.date.fromisoformat(out["date"])
+    return out
+
+
+def file_hash(path):
+    h = hashlib.sha1()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 16), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+# ── 3. Parsing ────────────────────────────────────────────────────────────────
+
+class ParseTimeout(Exception):
+    """Raised inside parse_fn when a file overruns its parse budget."""
+
+
+def _on_alarm(signum, frame):
+    raise ParseTimeout()
+
+
+def guarded_parse(parse_fn, path, budget=PARSE_BUDGET):
+    """
+    Run parse_fn(path) and return (parsed, skip_reason).
+
+    skip_reason is None on success, or a short note when the parse raised or
+    ran past `budget` seconds — in both cases parsed is None. The budget is
+    enforced with SIGALRM, so it only applies on POSIX in the main thread
+    (which includes process-pool workers); elsewhere the parse is unbounded.
+    """
+    timed = (budget and hasattr(signal, "setitimer")
+             and threading.current_thread() is threading.main_thread())
+    if timed:
+        previous = signal.signal(signal.SIGALRM, _on_alarm)
+        signal.setitimer(signal.ITIMER_REAL, budget)
+    try:
+        return parse_fn(path), None
+    except ParseTimeout:
+        return None, f"exceeded {budget:g}s parse budget"
+    except Exception as e:
+        return None, f"{type(e).__name__}: {e}"
+    finally:
+        if timed:
+            signal.setitimer(signal.ITIMER_REAL, 0)
+            signal.signal(signal.SIGALRM, previous)
+
+
+def parse_many(files, parse_fn, workers=None, budget=PARSE_BUDGET):
+    """
+    Return [guarded_parse(parse_fn, f, budget) for f in files], in the same order.
+
+    With workers > 1 (0 = one per CPU) and at least PARALLEL_MIN_FILES files,
+    the work is spread over a ProcessPoolExecutor. Files are submitted in
+    chunks of roughly len(files) / (4 * workers) so per-task pickling does
+    not dominate. `parse_fn` must be a module-level function. If the pool
+    cannot start, parsing falls back to the serial path.
+    """
+    task = functools.partial(guarded_parse, parse_fn, budget=budget)
+    if workers == 0:
+        workers = os.cpu_count() or 1
+    if not workers or workers <= 1 or len(files) < PARALLEL_MIN_FILES:
+        return [task(f) for f in files]
+
+    chunksize = max(1, len(files) // (workers * 4))
+    try:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            return list(pool.map(task, files, chunksize=chunksize))
+    except (OSError, BrokenProcessPool) as e:
+        print(f"   ⚠️  Process pool unavailable ({e}) — parsing serially.")
+        return [task(f) for f in files]
+
+
+# ── 4. Cached parse ───────────────────────────────────────────────────────────
+
+def cached_parse(files, parse_fn, digest_dir, namespace, version=1, prune=False,
+                 workers=None, budget=PARSE_BUDGET):
+    """
+    Return [parse_fn(f) for f in files], serving unchanged files from the cache.
+
+    A file is treated as unchanged when its mtime and size match the cached
+    entry; if either differs, its content hash is compared before re-parsing,
+    so a touched-but-identical file costs one read rather than a full parse.
+    Files that do need parsing go through parse_many(..., workers, budget);
+    a file that overruns the budget or raises is reported, recorded as
+    skipped and yields None, and is not retried until its content changes.
+
+    `namespace` names the cache file, separating the result shapes of
+    different parsers, and bumping `version` invalidates every entry in it.
+    With `prune=True` entries for files not in `files` are dropped, so pass
+    it only when `files` is everything the namespace should keep (the full
+    listing, or the whole date window a script ever reads).
+    """
+    index   = load_index(digest_dir, namespace, version)
+    entries = index["entries"]
+
+    dirty   = False
+    results = [None] * len(files)
+    misses  = []   # (position, name, stat, sha1)
+    for i, path in enumerate(files):
+        name = os.path.basename(path)
+        try:
+            st = os.stat(path)
+        except OSError:
+            continue
+        entry = entries.get(name)
+
+        if entry and entry["mtime"] == st.st_mtime_ns and entry["size"] == st.st_size:
+            results[i] = _decode(entry["parsed"])
+            continue
+
+        digest = file_hash(path)
+        if entry and entry["sha1"] == digest:
+            entry["mtime"], entry["size"] = st.st_mtime_ns, st.st_size
+            dirty = True
+            results[i] = _decode(entry["parsed"])
+            continue
+
+        misses.append((i, name, st, digest))
+
+    if misses:
+        outcomes = parse_many([files[i] for i, _, _, _ in misses], parse_fn, workers, budget)
+        for (i, name, st, digest), (parsed, skipped) in zip(misses, outcomes):
+            entries[name] = {
+                "mtime":  st.st_mtime_ns,
+                "size":   st.st_size,
+                "sha1":   digest,
+                "parsed": _encode(parsed),
+            }
+            if skipped:
+                entries[name]["skipped"] = skipped
+                print(f"   ⏱  Skipped {name} — {skipped}")
+            results[i] = parsed
+        dirty = True
+
+    if prune:
+        keep = {os.path.basename(p) for p in files}
+        stale = [name for name in entries if name not in keep]
+        for name in stale:
+            del entries[name]
+        dirty = dirty or bool(stale)
+
+    if dirty:
+        save_index(digest_dir, namespace, index)
+    return results
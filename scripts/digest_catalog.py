@@ -0,0 +1,54 @@
+"""
+Digest Catalog
+Sorted index of the digest files in a directory, built from file names only.
+
+Each digest's date is read from its name (digest-YYYY-MM-DD*.md) once, so
+date-window queries are answered with bisect and only the files inside the
+window ever need to be opened and parsed.
+"""
+
+import os
+import re
+import bisect
+import datetime
+
+_DIGEST_NAME = re.compile(r"^digest-.*?(\d{4}-\d{2}-\d{2}).*\.md$")
+
+
+class DigestCatalog:
+    """Date-sorted (date, path) list of digest files with O(log n) range lookups."""
+
+    def __init__(self, digest_dir):
+        entries = []
+        try:
+            with os.scandir(digest_dir) as it:
+                for entry in it:
+                    m = _DIGEST_NAME.match(entry.name)
+                    if not m:
+                        continue
+                    try:
+                        date = datetime.date.fromisoformat(m.group(1))
+                    except ValueError:
+                        continue
+                    entries.append((date, entry.path))
+        except FileNotFoundError:
+            pass
+        entries.sort()
+        self.dates = [d for d, _ in entries]
+        self.paths = [p for _, p in entries]
+
+    def __len__(self):
+        return len(self.paths)
+
+    def range(self, start=None, end=None):
+        """Paths of digests dated start..end (inclusive; None = unbounded), oldest first."""
+        lo = bisect.bisect_left(self.dates, start) if start is not None else 0
+        hi = bisect.bisect_right(self.dates, end) if end is not None else len(self.dates)
+        return self.paths[lo:hi]
+
+    def latest(self, n, start=None):
+        """Paths of the `n` most recent digests (dated start or later), oldest first."""
+        lo = max(len(self.paths) - n, 0)
+        if start is not None:
+            lo = max(lo, bisect.bisect_left(self.dates, start))
+        return self.paths[lo:] if n > 0 else []
@@ -0,0 +1,484 @@
+"""
+Digest Parser
+Single-pass tokenizer shared by bitcoin_chart.py and bitcoin_weekly_slides.py.
+
+tokenize() walks a digest once and splits it into headings, tables (as row
+dicts) and bold spans, and indexes every labelled line — table rows,
+"**label**：value" bullets, "label: value" lines and bare label headings —
+by the field it describes (price, 24h change, 1W/1M/1Y forecast).
+The extract_* helpers then read each value from that structure with
+dictionary lookups; the old whole-document regexes only run as a fallback
+when a digest has no labelled line for a field.
+
+Before parsing, fingerprint() sniffs the first few KB to tell which dialect
+a digest is written in, and parse() hands it to that dialect's own parser;
+the generic fallback chain only runs if that parser finds no price. Adding
+a dialect means one fingerprint rule and one DIALECTS parser; the other
+dialects' parsers are unaffected.
+"""
+
+import os
+import re
+import datetime
+
+
+# ── 1. Patterns ───────────────────────────────────────────────────────────────
+# Every pattern is compiled once at import and written to run in linear time:
+# numeric runs and whitespace gaps are bounded ({0,3}, {0,14}, ...), and no two
+# adjacent pieces can match the same characters, so a malformed line cannot
+# trigger backtracking. Open-ended pieces (\s*, \d+, .*, [^\n]+) appear only
+# at a pattern's tail, where they cannot fail, or right after a ^ anchor.
+
+# Field classifier — applied to short label strings only, never to the document
+_FIELD_PATTERNS = [
+    ("price",      re.compile(r"^(?:当前价格|价格\s{0,3}[（(]USD[）)]|Price\b)", re.IGNORECASE)),
+    ("change_24h", re.compile(r"^(?:24\s{0,3}小时涨跌|24\s{0,3}h\b)", re.IGNORECASE)),
+    ("1w",         re.compile(r"^(?:1\s{0,3}Week|1\s{0,3}周|下周)", re.IGNORECASE)),
+    ("1m",         re.compile(r"^(?:1\s{0,3}Month|1\s{0,3}个月)", re.IGNORECASE)),
+    ("1y",         re.compile(r"^(?:1\s{0,3}Year|1\s{0,3}年|年底\s{0,3}\d{4})", re.IGNORECASE)),
+]
+
+_DATE_IN_NAME = re.compile(r"(\d{4}-\d{2}-\d{2})")
+_HEADING      = re.compile(r"^(#{1,6})\s+(.*)$")
+_LIST_MARKER  = re.compile(r"^\s*(?:[-*+]|\d+[.)])\s+")
+_BOLD         = re.compile(r"\*\*([^*\n]{2,80})\*\*")
+_BOLD_LABEL   = re.compile(r"^\*\*([^*\n]{1,40})\*\*\s*[：:]?\s*(.*)$")
+_PLAIN_LABEL  = re.compile(r"^([^：:|$*]{1,30})[：:]\s*(.*)$")
+_LEAD_SYMBOLS = re.compile(r"^[^\w$]+")
+
+_MONEY        = re.compile(r"\$\s{0,3}(\d[\d,]{0,14}(?:\.\d{1,2})?)\s{0,3}([Kk])?")
+_PLUS_MINUS   = re.compile(r"\$\s{0,3}(\d[\d,]{0,14})\s{0,3}(?:±|\+/-)\s{0,3}(?:\$\s{0,3})?(\d[\d,]{0,14})")
+_PERCENT      = re.compile(r"(?<![\d.])([+-]?\d{1,4}(?:\.\d{1,4})?)\s{0,3}%")
+_LEAD_PRICE   = re.compile(r"[\s*]{0,8}\$\s{0,3}(\d[\d,]{0,14})")
+_NEXT_PRICE   = re.compile(r"\*?\*?\$?\s{0,3}(\d[\d,]{0,14})")
+_ABOUT_PRICE  = re.compile(r"^(?:约\s{0,3})?\$\s{0,3}(\d[\d,]{0,14})\s{0,3}美元$")
+_CELL_PRICE   = re.compile(r"^\*{0,2}\$\s{0,3}(\d[\d,]{4,14})\s{0,3}\*{0,2}$")
+_LOOSE_PRICE  = re.compile(r"\$\s{0,3}(\d[\d,]{4,14})")
+_BOLD_ONLY    = re.compile(r"^\*\*[^*\n]*\*\*$")
+
+# Legacy whole-document fallbacks (only used when no labelled line exists)
+_FALLBACK_FORECAST = {
+    "1w": re.compile(r"(?:1\s{0,3}Week|下周|1\s{0,3}周)[^\n]+", re.IGNORECASE),
+    "1m": re.compile(r"(?:1\s{0,3}Month|1\s{0,3}个月)[^\n]+", re.IGNORECASE),
+    "1y": re.compile(r"(?:1\s{0,3}Year|年底\d{4})[^\n]+", re.IGNORECASE),
+}
+_FALLBACK_CHANGE = re.compile(r"24小时涨跌幅?[^\n\d+-]{0,40}([+-]?\d{1,4}(?:\.\d{1,4})?)\s{0,3}%")
+
+# Lines containing these keywords are remembered by their first position
+_MARKERS = ("白话总结", "白话")
+
+NEWS_LIMIT = 4
+
+
+# ── 2. Tokenizer ──────────────────────────────────────────────────────────────
+
+def _split_row(line):
+    cells = line.strip().strip("|").split("|")
+    return [c.strip() for c in cells]
+
+
+def _classify(label):
+    label = _LEAD_SYMBOLS.sub("", label.replace("*", "").strip())
+    for name, pattern in _FIELD_PATTERNS:
+        if pattern.match(label):
+            return name
+    return None
+
+
+def tokenize(content):
+    """
+    Split a digest into its structural parts in one pass over the lines.
+
+    Returns a dict with:
+      lines    — the raw lines
+      headings — [(level, text, line_idx)]
+      tables   — [{"header": [...], "rows": [{header: cell}], "cells": [[...]], "line": idx}]
+      fields   — {field: [(kind, line_idx, value_text)]} in document order,
+                 kind is "table", "label" or "heading" (value on the next line)
+      bolds    — [(line_idx, start, end, text)] for every **bold** span
+      marks    — {keyword: first line_idx containing it}
+    """
+    lines    = content.splitlines()
+    headings = []
+    tables   = []
+    fields   = {}
+    bolds    = []
+    marks    = {}
+    table    = None
+
+    for idx, line in enumerate(lines):
+        stripped = line.strip()
+
+        for kw in _MARKERS:
+            if kw not in marks and kw in line:
+                marks[kw] = idx
+
+        if "**" in line:
+            for m in _BOLD.finditer(line):
+                bolds.append((idx, m.start(), m.end(), m.group(1)))
+
+        # ── Tables ────────────────────────────────────────────────────────
+        if stripped.startswith("|"):
+            cells = _split_row(stripped)
+            if table is None:
+                table = {"header": cells, "rows": [], "cells": [], "line": idx}
+                tables.append(table)
+            elif not all(set(c) <= set("-: ") for c in cells):
+                table["rows"].append(dict(zip(table["header"], cells)))
+                table["cells"].append(cells)
+            field = _classify(cells[0]) if cells else None
+            if field:
+                rest = stripped[1:]
+                rest = rest[rest.find("|") + 1:] if "|" in rest else ""
+                fields.setdefault(field, []).append(("table", idx, rest))
+            continue
+        table = None
+
+        if not stripped:
+            continue
+
+        # ── Headings ──────────────────────────────────────────────────────
+        hm = _HEADING.match(stripped)
+        if hm:
+            text = hm.group(2).strip()
+            headings.append((len(hm.group(1)), text, idx))
+            field = _classify(text)
+            if field:
+                fields.setdefault(field, []).append(("heading", idx, text))
+            continue
+
+        # ── Labelled lines: "**label**：value", "label: value", bare label ─
+        body = _LIST_MARKER.sub("", stripped, count=1)
+        lm = _BOLD_LABEL.match(body) or _PLAIN_LABEL.match(body)
+        if lm:
+            field = _classify(lm.group(1))
+            if field:
+                value = lm.group(2).strip()
+                kind  = "label" if value else "heading"
+                fields.setdefault(field, []).append((kind, idx, value))
+        elif len(body) <= 30 and "$" not in body:
+            field = _classify(body)
+            if field:
+                fields.setdefault(field, []).append(("heading", idx, body))
+
+    return {
+        "lines":    lines,
+        "headings": headings,
+        "tables":   tables,
+        "fields":   fields,
+        "bolds":    bolds,
+        "marks":    marks,
+    }
+
+
+# ── 3. Value helpers ──────────────────────────────────────────────────────────
+
+def _money(m):
+    value = float(m.group(1).replace(",", ""))
+    if m.lastindex and m.lastindex >= 2 and m.group(2):
+        value *= 1000
+    return value
+
+
+def parse_range(text):
+    """
+    Parse a forecast value into {"low", "high", "kind", "label"}:
+      target ± margin:  $69,500 ± $1,500   →  kind "pm"
+      low–high range:   $65,000–$73,300    →  kind "range"  ($143K also accepted)
+      single value:     $70,000            →  kind "single" (low == high)
+    Returns None if the text holds no dollar amount.
+    """
+    pm = _PLUS_MINUS.search(text)
+    if pm:
+        target = float(pm.group(1).replace(",", ""))
+        margin = float(pm.group(2).replace(",", ""))
+        return {"low": target - margin, "high": target + margin, "kind": "pm",
+                "label": f"${target:,.0f} ± ${margin:,.0f}"}
+    tokens = []
+    for m in _MONEY.finditer(text):
+        tokens.append(m)
+        if len(tokens) == 2:
+            break
+    if not tokens:
+        return None
+    if len(tokens) == 2 and not any(ch.isdigit() for ch in text[tokens[0].end():tokens[1].start()]):
+        lo, hi = _money(tokens[0]), _money(tokens[1])
+        return {"low": lo, "high": hi, "kind": "range",
+                "label": f"${lo:,.0f} – ${hi:,.0f}"}
+    v = _money(tokens[0])
+    return {"low": v, "high": v, "kind": "single", "label": f"${v:,.0f}"}
+
+
+def _next_line(doc, idx):
+    lines = doc["lines"]
+    return lines[idx + 1] if idx + 1 < len(lines) else ""
+
+
+def date_from_filename(filepath):
+    m = _DATE_IN_NAME.search(os.path.basename(filepath))
+    return datetime.date.fromisoformat(m.group(1)) if m else None
+
+
+# ── 4. Extractors ─────────────────────────────────────────────────────────────
+
+def _price_labelled(doc):
+    """Table row or label: | 价格（USD） | $67,811 |  /  Price (USD): **$68,341**"""
+    for kind, idx, value in doc["fields"].get("price", []):
+        if kind != "heading":
+            m = _LEAD_PRICE.match(value)
+            if m:
+                return float(m.group(1).replace(",", ""))
+    return None
+
+
+def _price_heading(doc):
+    """Heading style: ## 💰 当前价格\n**$69,131** 美元"""
+    for kind, idx, value in doc["fields"].get("price", []):
+        if kind == "heading":
+            m = _NEXT_PRICE.match(_next_line(doc, idx))
+            if m:
+                return float(m.group(1).replace(",", ""))
+    return None
+
+
+def _price_about(doc):
+    """Older Chinese format: **约 $67,243 美元**"""
+    for _, _, _, text in doc["bolds"]:
+        m = _ABOUT_PRICE.match(text.strip())
+        if m:
+            return float(m.group(1).replace(",", ""))
+    return None
+
+
+def _price_cell(doc):
+    """Any table cell holding a 5+ digit dollar figure."""
+    for table in doc["tables"]:
+        for cells in [table["header"]] + table["cells"]:
+            for cell in cells:
+                m = _CELL_PRICE.match(cell)
+                if m:
+                    return float(m.group(1).replace(",", ""))
+    return None
+
+
+def _price_loose(doc):
+    """Last resort: first 5+ digit dollar figure anywhere."""
+    for line in doc["lines"]:
+        if "$" in line:
+            m = _LOOSE_PRICE.search(line)
+            if m:
+                return float(m.group(1).replace(",", ""))
+    return None
+
+
+_PRICE_CHAIN = (_price_labelled, _price_heading, _price_about, _price_cell, _price_loose)
+
+
+def extract_price(doc):
+    """Current price from the first layout in the full chain that matches."""
+    for strategy in _PRICE_CHAIN:
+        value = strategy(doc)
+        if value is not None:
+            return value
+    return None
+
+
+def extract_change_24h(doc, fallback=True):
+    """
+    24h change in percent; a ↓ marker on the same line makes it negative.
+    `fallback` enables the line scan for an unlabelled 24小时涨跌 mention.
+    """
+    for kind, idx, value in doc["fields"].get("change_24h", []):
+        text = _next_line(doc, idx) if kind == "heading" else value
+        m = _PERCENT.search(text)
+        if m:
+            change = float(m.group(1))
+            return -abs(change) if "↓" in text else change
+
+    if not fallback:
+        return None
+    lines = doc["lines"]
+    for idx, line in enumerate(lines):
+        if "24小时涨跌" in line:
+            m = _FALLBACK_CHANGE.search(line)
+            if m:
+                change = float(m.group(1))
+                return -abs(change) if "↓" in line else change
+    return None
+
+
+def extract_forecast(doc, horizon):
+    """Forecast for horizon "1w" / "1m" / "1y" as a parse_range() dict, or None."""
+    for kind, idx, value in doc["fields"].get(horizon, []):
+        text = _next_line(doc, idx) if kind == "heading" else value
+        result = parse_range(text)
+        if result:
+            return result
+
+    m = _FALLBACK_FORECAST[horizon].search("\n".join(doc["lines"]))
+    return parse_range(m.group(0)) if m else None
+
+
+def _news_ok(title):
+    return "|" not in title and "$" not in title[:3]
+
+
+def extract_news(doc, limit=NEWS_LIMIT):
+    """
+    News items as [{"title", "body"}], trying three layouts in order:
+      A: **title**\\nbody on the next line
+      B: **title**：body on the same line
+      C: **title** — body (em dash)
+    The first layout that yields any item wins, as in the original parsers.
+    """
+    lines = doc["lines"]
+    fmt_a, fmt_b, fmt_c = [], [], []
+    last_line = -1
+    for idx, start, end, title in doc["bolds"]:
+        line  = lines[idx]
+        title_s = title.strip()
+        if not _news_ok(title_s):
+            continue
+
+        if end == len(line) and idx + 1 < len(lines):
+            body = lines[idx + 1].split("#", 1)[0]
+            if len(body) >= 20:
+                fmt_a.append({"title": title_s, "body": body[:500].strip()})
+                continue
+
+        if idx == last_line:
+            continue
+        rest = line[end:]
+        if rest[:1] in ("：", ":"):
+            body = rest[1:].lstrip()
+            if len(body) >= 20:
+                fmt_b.append({"title": title_s, "body": body[:500].strip()})
+                last_line = idx
+                continue
+        dash = rest.lstrip()
+        if dash[:1] in ("—", "–", "-"):
+            body = dash.lstrip("—–-").lstrip()
+            if len(body) >= 20:
+                fmt_c.append({"title": title_s, "body": body[:500].strip()})
+                last_line = idx
+
+    for items in (fmt_a, fmt_b, fmt_c):
+        if items:
+            return items[:limit]
+    return []
+
+
+def _skip_blank(lines, idx):
+    while idx < len(lines) and not lines[idx].strip():
+        idx += 1
+    return idx
+
+
+def extract_plain_summary(doc):
+    """Paragraph under the 白话总结 heading (after its bold one-liner), or ""."""
+    lines = doc["lines"]
+    marks = doc["marks"]
+
+    if "白话总结" in marks:
+        i = _skip_blank(lines, marks["白话总结"] + 1)
+        if i < len(lines) and _BOLD_ONLY.match(lines[i]):
+            i = _skip_blank(lines, i + 1)
+            if i < len(lines):
+                text = lines[i].split("#", 1)[0]
+                if len(text) >= 30:
+                    return text.strip()
+
+    # Fallback: the paragraph after any "白话" line
+    if "白话" in marks:
+        i = _skip_blank(lines, marks["白话"] + 1)
+        para = []
+        while i < len(lines) and lines[i].strip():
+            para.append(lines[i])
+            i += 1
+        return "\n".join(para).strip()[:300]
+    return ""
+
+
+# ── 5. Dialects ───────────────────────────────────────────────────────────────
+
+FINGERPRINT_CHARS = 4096
+
+# Checked in order against the head of the file; the first match wins. Each
+# rule is anchored on the line that carries the price in that dialect, so a
+# digest that matches none of them is parsed as "generic".
+_FINGERPRINTS = [
+    ("zh_metric_table",  re.compile(r"^\|\s*\*{0,2}价格\s*[（(]USD[）)]", re.MULTILINE)),
+    ("zh_current_table", re.compile(r"^\|\s*\*{0,2}当前价格\*{0,2}\s*\|", re.MULTILINE)),
+    ("zh_heading",       re.compile(r"^#{1,6}[^\n\w]{0,8}当前价格", re.MULTILINE)),
+    ("en_table",         re.compile(r"^\|\s*\*{0,2}Price\s*\(USD\)", re.MULTILINE | re.IGNORECASE)),
+    ("legacy_2026_03",   re.compile(r"\*\*约\s{0,3}\$\s{0,3}\d[\d,]{0,14}\s{0,3}美元\*\*")),
+]
+
+
+# Dialect parsers: each reads the price and 24h change from the one layout its
+# dialect writes them in, and returns (price, change_24h).
+
+def _parse_zh_table(doc):
+    """| **价格（USD）** | $67,811 |  /  | 当前价格 | **$65,600** |"""
+    return _price_labelled(doc), extract_change_24h(doc)
+
+
+def _parse_zh_heading(doc):
+    """## 💰 当前价格\n**$69,131** 美元"""
+    return _price_heading(doc), extract_change_24h(doc)
+
+
+def _parse_en_table(doc):
+    """| **Price (USD)** | **$68,341** |  — no Chinese 24小时涨跌 line to scan for"""
+    return _price_labelled(doc), extract_change_24h(doc, fallback=False)
+
+
+def _parse_legacy_2026_03(doc):
+    """今日收盘 **约 $67,243 美元**，..."""
+    return _price_about(doc), extract_change_24h(doc)
+
+
+def _parse_generic(doc):
+    """Anything unrecognised: the full price chain and every change fallback."""
+    return extract_price(doc), extract_change_24h(doc)
+
+
+DIALECTS = {
+    "zh_metric_table":  _parse_zh_table,
+    "zh_current_table": _parse_zh_table,
+    "zh_heading":       _parse_zh_heading,
+    "en_table":         _parse_en_table,
+    "legacy_2026_03":   _parse_legacy_2026_03,
+    "generic":          _parse_generic,
+}
+
+
+def fingerprint(content):
+    """Name the dialect of a digest from its first FINGERPRINT_CHARS characters."""
+    head = content[:FINGERPRINT_CHARS]
+    for dialect, pattern in _FINGERPRINTS:
+        if pattern.search(head):
+            return dialect
+    return "generic"
+
+
+def parse(content):
+    """
+    Fingerprint and tokenize once, and return every field both bitcoin
+    scripts need. The generic chain only runs when the dialect's own parser
+    finds no price; such digests report their dialect as "<dialect>→generic".
+    """
+    dialect = fingerprint(content)
+    doc     = tokenize(content)
+    price, change = DIALECTS[dialect](doc)
+    if price is None and dialect != "generic":
+        price, change = _parse_generic(doc)
+        dialect += "→generic"
+    return {
+        "dialect":       dialect,
+        "actual_price":  price,
+        "change_24h":    change,
+        "forecasts":     {h: extract_forecast(doc, h) for h in ("1w", "1m", "1y")},
+        "news":          extract_news(doc),
+        "plain_summary": extract_plain_summary(doc),
+    }
@@ -0,0 +1,195 @@
+"""
+Digest Column Store
+Memory-mapped columnar history of parsed digests for long-horizon analysis.
+
+One NumPy .npy file per column lives under <digest_dir>/.digest-columns/ and
+is opened with np.load(mmap_mode="r"), so callers can slice years of history
+without loading or copying it. Column files are preallocated with spare
+capacity and appended in place as new digests arrive; meta.json records how
+many rows are valid and is written last, so readers never see a torn row.
+"""
+
+import os
+import json
+import datetime
+
+import numpy as np
+
+STORE_DIRNAME = ".digest-columns"
+STORE_VERSION = 2
+MIN_CAPACITY  = 256
+
+# Column name → dtype. Missing values are NaN (floats) or "" (kinds) — dates
+# are never missing. Forecasts are stored exactly as digest_parser returns
+# them (low/high plus kind "range", "pm" or "single"), whichever script wrote
+# the row; any widening for display is the reader's business.
+COLUMNS = {
+    "date":         "datetime64[D]",
+    "actual_price": "float64",
+    "change_24h":   "float64",
+    "1w_low":       "float64",
+    "1w_high":      "float64",
+    "1m_low":       "float64",
+    "1m_high":      "float64",
+    "1y_low":       "float64",
+    "1y_high":      "float64",
+    "1w_kind":      "<U6",
+    "1m_kind":      "<U6",
+    "1y_kind":      "<U6",
+}
+
+
+def _row(d):
+    """Flatten a parsed digest (either script's shape) into a column row."""
+    fc = d.get("forecasts", {})
+    row = {
+        "date":         np.datetime64(d["date"], "D"),
+        "actual_price": d.get("actual_price"),
+        "change_24h":   d.get("change_24h"),
+    }
+    for h in ("1w", "1m", "1y"):
+        lo, hi = fc.get(f"{h}_low"), fc.get(f"{h}_high")
+        if lo is None and fc.get(f"{h}_range"):
+            lo, hi = fc[f"{h}_range"]
+        row[f"{h}_low"], row[f"{h}_high"] = lo, hi
+        row[f"{h}_kind"] = fc.get(f"{h}_kind") or ""
+    return {k: (np.nan if v is None else v) for k, v in row.items()}
+
+
+class DigestStore:
+    """Append-only (plus in-place update) columnar store of digest history."""
+
+    def __init__(self, digest_dir):
+        self.path = os.path.join(digest_dir, STORE_DIRNAME)
+        self.meta = self._load_meta()
+
+    # ── Files ─────────────────────────────────────────────────────────────
+
+    def _meta_path(self):
+        return os.path.join(self.path, "meta.json")
+
+    def _column_path(self, name):
+        return os.path.join(self.path, f"{name}.npy")
+
+    def _load_meta(self):
+        try:
+            with open(self._meta_path(), "r", encoding="utf-8") as f:
+                meta = json.load(f)
+        except (OSError, ValueError):
+            return {"version": STORE_VERSION, "rows": 0, "capacity": 0}
+        if meta.get("version") != STORE_VERSION or not all(
+                os.path.exists(self._column_path(c)) for c in COLUMNS):
+            return {"version": STORE_VERSION, "rows": 0, "capacity": 0}
+        return meta
+
+    def _save_meta(self):
+        tmp = self._meta_path() + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(self.meta, f)
+        os.replace(tmp, self._meta_path())
+
+    def _allocate(self, capacity, keep_rows):
+        """(Re)create every column with `capacity` slots, keeping the first `keep_rows`."""
+        os.makedirs(self.path, exist_ok=True)
+        for name, dtype in COLUMNS.items():
+            path = self._column_path(name)
+            tmp  = path + ".tmp"
+            new  = np.lib.format.open_memmap(tmp, mode="w+", dtype=dtype, shape=(capacity,))
+            if keep_rows:
+                new[:keep_rows] = np.load(path, mmap_mode="r")[:keep_rows]
+            new.flush()
+            del new
+            os.replace(tmp, path)
+        self.meta["capacity"] = capacity
+
+    # ── Reading ───────────────────────────────────────────────────────────
+
+    def __len__(self):
+        return self.meta["rows"]
+
+    def columns(self):
+        """{column: read-only memmap view of all valid rows}."""
+        n = self.meta["rows"]
+        if not n:
+            return {name: np.empty(0, dtype=dtype) for name, dtype in COLUMNS.items()}
+        return {name: np.load(self._column_path(name), mmap_mode="r")[:n] for name in COLUMNS}
+
+    def slice(self, start=None, end=None):
+        """Columns for digests dated start..end (inclusive) — views, not copies."""
+        cols  = self.columns()
+        dates = cols["date"]
+        lo = np.searchsorted(dates, np.datetime64(start, "D"), "left") if start else 0
+        hi = np.searchsorted(dates, np.datetime64(end, "D"), "right") if end else len(dates)
+        return {name: arr[lo:hi] for name, arr in cols.items()}
+
+    # ── Writing ───────────────────────────────────────────────────────────
+
+    def update(self, digests):
+        """
+        Bring the store in line with `digests` (parsed dicts, any order).
+        New dates after the last stored row are appended in place and known
+        dates are overwritten in place; a date that would land in the middle
+        of the history triggers a one-off rewrite. Returns rows appended.
+        """
+        return self._apply(sorted((_row(d) for d in digests if d and d.get("date")),
+                                  key=lambda r: r["date"]))
+
+    def _apply(self, rows):
+        """update() for rows already flattened by _row, sorted by date."""
+        if not rows:
+            return 0
+
+        n     = self.meta["rows"]
+        dates = self.columns()["date"]
+        last  = dates[-1] if n else None
+
+        overwrite, append = [], []
+        for r in rows:
+            if last is not None and r["date"] <= last:
+                i = int(np.searchsorted(dates, r["date"]))
+                if i >= n or dates[i] != r["date"]:
+                    return self._rewrite(rows)
+                overwrite.append((i, r))
+            elif append and append[-1]["date"] == r["date"]:
+                append[-1] = r
+            else:
+                append.append(r)
+
+        needed = n + len(append)
+        if needed > self.meta["capacity"]:
+            self._allocate(max(MIN_CAPACITY, self.meta["capacity"] * 2, needed), keep_rows=n)
+
+        for name in COLUMNS:
+            col = np.load(self._column_path(name), mmap_mode="r+")
+            for i, r in overwrite:
+                col[i] = r[name]
+            if append:
+                col[n:needed] = [r[name] for r in append]
+            col.flush()
+            del col
+
+        self.meta["rows"] = needed
+        self._save_meta()
+        return len(append)
+
+    def _rewrite(self, rows):
+        """Merge stored rows with `rows` (new values win) and rewrite every column."""
+        merged = {}
+        cols = self.columns()
+        for i in range(self.meta["rows"]):
+            merged[cols["date"][i]] = {name: cols[name][i] for name in COLUMNS}
+        before = len(merged)
+        for r in rows:
+            merged[r["date"]] = r
+        del cols
+
+        ordered = [merged[d] for d in sorted(merged)]
+        self.meta["rows"] = 0
+        self._allocate(max(MIN_CAPACITY, len(ordered) * 2), keep_rows=0)
+        self._apply(ordered)
+        return len(merged) - before
+
+
+def to_dates(date_column):
+    """Convert a datetime64[D] column to a list of datetime.date."""
+    return date_column.astype(datetime.date).tolist()
@@ -0,0 +1,175 @@
+"""
+Synthetic Digest Generator
+Writes realistic digest-YYYY-MM-DD.md files that mix every layout the
+bitcoin parsers handle, for benchmarks and load tests.
+
+Price layouts:
+  zh_metric_table  | **价格（USD）** | $67,811 |
+  zh_current_table | 当前价格 | **$65,600** |
+  en_table         | Price (USD) | **$67,341** |
+  zh_heading       ## 💰 当前价格 / **$69,131** 美元
+  zh_about         **约 $67,243 美元**            (older Chinese fallback)
+  line_scan        bare table cell with a 5+ digit dollar figure
+News layouts:
+  news_a  **title**\\nbody     news_b  **title**：body     news_c  **title** — body
+
+Usage:
+  python scripts/digest_synth.py OUT_DIR [-n 1000] [--seed 0]
+"""
+
+import os
+import json
+import random
+import argparse
+import datetime
+
+PRICE_FORMATS = ("zh_metric_table", "zh_current_table", "en_table",
+                 "zh_heading", "zh_about", "line_scan")
+NEWS_FORMATS  = ("news_a", "news_b", "news_c")
+
+_ZH_NEWS = [
+    ("贝莱德ETF单日净流入创新高", "贝莱德旗下现货比特币ETF昨日净流入超过5亿美元，为近一个月以来的最高水平。"),
+    ("美联储官员暗示降息推迟", "多位美联储官员表示通胀仍具粘性，市场对降息的预期明显降温，风险资产承压。"),
+    ("矿工抛压减弱", "链上数据显示矿工钱包余额连续三日回升，抛压明显减小，算力维持历史高位。"),
+    ("交易所余额降至五年低点", "CryptoQuant数据显示交易所比特币余额持续下降，长期持有者继续提币至冷钱包。"),
+    ("期权市场看涨情绪升温", "Deribit未平仓合约中看涨期权占比上升，月底到期的行权价集中在较高区间。"),
+]
+_EN_NEWS = [
+    ("ETF inflows continue", "Spot bitcoin ETFs recorded another day of net inflows, led by IBIT and FBTC."),
+    ("Fed minutes lean hawkish", "Minutes from the latest FOMC meeting showed officials wary of cutting too early."),
+    ("Hashrate hits new record", "Network hashrate climbed to a new all-time high as next-generation rigs come online."),
+    ("Options skew turns bullish", "Call open interest outpaced puts on Deribit ahead of the monthly expiry."),
+]
+_ZH_SUMMARY = [
+    "比特币今天小幅波动，宏观消息面偏空，但机构资金仍在持续流入，长期趋势没有改变，耐心持有即可。",
+    "今天行情反弹，市场情绪明显回暖，不过短线追高风险较大，可以等回调再考虑分批建仓比较稳妥。",
+]
+
+
+# ── 1. Building blocks ────────────────────────────────────────────────────────
+
+def _money(v):
+    return f"${v:,.0f}"
+
+
+def _forecast_lines(price, rng, zh, style):
+    """Forecast section in either table or bullet style, mixing range and ± forms."""
+    w_lo, w_hi = price * rng.uniform(0.93, 0.98), price * rng.uniform(1.02, 1.07)
+    m_mid, m_pm = price * rng.uniform(0.97, 1.05), price * rng.uniform(0.05, 0.1)
+    y_lo, y_hi = rng.choice([100, 110, 120, 130]), rng.choice([150, 160, 180, 200])
+    year = "年底2026主流" if zh else "1 Year"
+    wk, mo = ("1周", "1个月") if zh else ("1 Week", "1 Month")
+    if style == "table":
+        head = "| 周期 | 预测区间 | 信心 |\n|------|----------|------|" if zh else \
+               "| Horizon | Range | Confidence |\n|---|---|---|"
+        return "\n".join([
+            head,
+            f"| {wk} | {_money(w_lo)} – {_money(w_hi)} | 中 |",
+            f"| {mo} | {_money(m_mid)} ± {_money(m_pm)} | 低 |",
+            f"| {year} | ${y_lo}K – ${y_hi}K | 低 |",
+        ])
+    return "\n".join([
+        f"- **{wk}**：{_money(w_lo)} – {_money(w_hi)}",
+        f"- **{mo}**：{_money(m_mid)} ± {_money(m_pm)}",
+        f"- {year}：${y_lo},000 – ${y_hi},000",
+    ])
+
+
+def _news(rng, zh, fmt):
+    pool = _ZH_NEWS if zh else _EN_NEWS
+    items = rng.sample(pool, k=min(len(pool), rng.randint(2, 4)))
+    out = []
+    for title, body in items:
+        if fmt == "news_a":
+            out.append(f"**{title}**\n{body}\n")
+        elif fmt == "news_b":
+            out.append(f"**{title}**：{body}\n")
+        else:
+            out.append(f"**{title}** — {body}\n")
+    return "\n".join(out)
+
+
+# ── 2. Digest templates ───────────────────────────────────────────────────────
+
+def make_digest(date, price, price_format, news_format, rng):
+    """Return the markdown text of one digest in the given layouts."""
+    change = rng.uniform(-5, 5)
+    arrow  = "↓" if change < 0 else "↑"
+    zh     = price_format != "en_table"
+    title  = f"# 比特币每日摘要 — {date}" if zh else f"# Bitcoin Daily Digest — {date}"
+    parts  = [title, ""]
+
+    if price_format == "zh_metric_table":
+        parts += ["## 📊 市场数据", "", "| 指标 | 数值 |", "|------|------|",
+                  f"| **价格（USD）** | {_money(price)} |",
+                  f"| **24小时涨跌幅** | {arrow} {abs(change):.1f}% |",
+                  f"| 市值 | ${price * 19.8e6 / 1e12:.2f}T |", ""]
+    elif price_format == "zh_current_table":
+        parts += ["| 指标 | 数值 |", "|---|---|",
+                  f"| 当前价格 | **{_money(price)}** |",
+                  f"| 24小时涨跌 | {change:+.1f}% |", ""]
+    elif price_format == "en_table":
+        parts += ["| Metric | Value |", "|--------|-------|",
+                  f"| Price (USD) | **{_money(price)}** |",
+                  f"| 24h Change | {change:+.1f}% |", ""]
+    elif price_format == "zh_heading":
+        parts += ["## 💰 当前价格", f"**{_money(price)}** 美元", "",
+                  f"24小时涨跌：{change:+.1f}%", ""]
+    elif price_format == "zh_about":
+        parts += [f"今日收盘 **约 {_money(price)} 美元**，较昨日{'下跌' if change < 0 else '上涨'}。", ""]
+    else:  # line_scan
+        parts += ["| 项目 | 数据 | 备注 |", "|---|---|---|",
+                  f"| 收盘 | {_money(price)} | 参考 |", ""]
+
+    parts += ["## 🔮 价格预测" if zh else "## Forecast", "",
+              _forecast_lines(price, rng, zh, rng.choice(("table", "bullets"))), ""]
+    parts += ["## 📰 今日新闻" if zh else "## News", "", _news(rng, zh, news_format)]
+    if zh:
+        parts += ["## 🗣️ 白话总结", "", "**一句话：短期震荡，长期看涨**", "",
+                  rng.choice(_ZH_SUMMARY), ""]
+    return "\n".join(parts)
+
+
+# ── 3. Corpus ─────────────────────────────────────────────────────────────────
+
+def write_corpus(out_dir, n, seed=0, end=None):
+    """
+    Write `n` digests ending at `end` (default: today), one per day, cycling
+    through every price and news layout. Returns a manifest list of
+    {"path", "date", "price", "price_format", "news_format"}.
+    """
+    rng   = random.Random(seed)
+    end   = end or datetime.date.today()
+    start = end - datetime.timedelta(days=n - 1)
+    os.makedirs(out_dir, exist_ok=True)
+
+    manifest = []
+    price = 60000.0
+    for i in range(n):
+        date  = start + datetime.timedelta(days=i)
+        price = max(1000.0, price * (1 + rng.gauss(0.0005, 0.03)))
+        pf    = PRICE_FORMATS[i % len(PRICE_FORMATS)]
+        nf    = NEWS_FORMATS[(i // len(PRICE_FORMATS)) % len(NEWS_FORMATS)]
+        path  = os.path.join(out_dir, f"digest-{date.isoformat()}.md")
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(make_digest(date, price, pf, nf, rng))
+        manifest.append({"path": path, "date": date.isoformat(), "price": round(price),
+                         "price_format": pf, "news_format": nf})
+    return manifest
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Write synthetic bitcoin digests")
+    parser.add_argument("out_dir")
+    parser.add_argument("-n", type=int, default=1000, help="number of digests (default 1000)")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    manifest = write_corpus(args.out_dir, args.n, seed=args.seed)
+    with open(os.path.join(args.out_dir, "manifest.json"), "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=1)
+    print(f"✅ Wrote {len(manifest)} digests to {args.out_dir}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,142 @@
+"""
+Digest Directory Watcher
+Yields batches of new or changed digest files as they land in a directory.
+
+On Linux the kernel's inotify API is used directly through ctypes (no extra
+dependency); everywhere else — or if inotify is unavailable — the directory
+is polled. Bursts of events (editors writing temp files, a sync client
+touching the file several times) are debounced into a single batch.
+"""
+
+import os
+import re
+import sys
+import time
+import errno
+import select
+import struct
+import ctypes
+import ctypes.util
+
+_DIGEST_NAME = re.compile(r"^digest-.*\d{4}-\d{2}-\d{2}.*\.md$")
+
+# inotify(7) constants
+_IN_MODIFY      = 0x00000002
+_IN_CLOSE_WRITE = 0x00000008
+_IN_MOVED_TO    = 0x00000080
+_IN_CREATE      = 0x00000100
+_IN_NONBLOCK    = 0o4000
+_IN_CLOEXEC     = 0o2000000
+_EVENT_HEADER   = struct.Struct("iIII")
+
+
+# ── 1. Backends ───────────────────────────────────────────────────────────────
+
+class _InotifyBackend:
+    """Blocking-with-timeout reader over an inotify watch on one directory."""
+
+    def __init__(self, directory):
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        self._fd = libc.inotify_init1(_IN_NONBLOCK | _IN_CLOEXEC)
+        if self._fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        mask = _IN_CLOSE_WRITE | _IN_MOVED_TO | _IN_CREATE | _IN_MODIFY
+        wd = libc.inotify_add_watch(self._fd, os.fsencode(directory), mask)
+        if wd < 0:
+            err = ctypes.get_errno()
+            os.close(self._fd)
+            raise OSError(err, f"inotify_add_watch failed for {directory}")
+        self.directory = directory
+
+    def poll(self, timeout):
+        """Return the set of file names touched within `timeout` seconds."""
+        ready, _, _ = select.select([self._fd], [], [], timeout)
+        if not ready:
+            return set()
+        try:
+            buf = os.read(self._fd, 64 * 1024)
+        except OSError as e:
+            if e.errno == errno.EAGAIN:
+                return set()
+            raise
+        names, pos = set(), 0
+        while pos + _EVENT_HEADER.size <= len(buf):
+            _, _, _, length = _EVENT_HEADER.unpack_from(buf, pos)
+            pos += _EVENT_HEADER.size
+            name = buf[pos:pos + length].rstrip(b"\0").decode("utf-8", "replace")
+            pos += length
+            if name:
+                names.add(name)
+        return names
+
+    def close(self):
+        os.close(self._fd)
+
+
+class _PollingBackend:
+    """Compares (mtime, size) snapshots of the directory every `interval` seconds."""
+
+    def __init__(self, directory, interval=5.0):
+        self.directory = directory
+        self.interval  = interval
+        self._snapshot = self._scan()
+
+    def _scan(self):
+        snap = {}
+        try:
+            with os.scandir(self.directory) as it:
+                for entry in it:
+                    if _DIGEST_NAME.match(entry.name):
+                        st = entry.stat()
+                        snap[entry.name] = (st.st_mtime_ns, st.st_size)
+        except FileNotFoundError:
+            pass
+        return snap
+
+    def poll(self, timeout):
+        time.sleep(min(timeout, self.interval))
+        snap = self._scan()
+        changed = {name for name, sig in snap.items() if self._snapshot.get(name) != sig}
+        self._snapshot = snap
+        return changed
+
+    def close(self):
+        pass
+
+
+def open_backend(directory, poll_interval=5.0):
+    """inotify on Linux, polling everywhere else (or if inotify cannot start)."""
+    if sys.platform.startswith("linux"):
+        try:
+            return _InotifyBackend(directory)
+        except (OSError, AttributeError) as e:
+            print(f"   ⚠️  inotify unavailable ({e}) — polling every {poll_interval:.0f}s.")
+    return _PollingBackend(directory, poll_interval)
+
+
+# ── 2. Debounced change stream ────────────────────────────────────────────────
+
+def iter_changes(directory, debounce=2.0, max_wait=30.0, poll_interval=5.0):
+    """
+    Yield sorted lists of digest paths that were created or modified.
+
+    After the first event, events keep being collected until the directory
+    has been quiet for `debounce` seconds (or `max_wait` seconds have passed),
+    so a burst of writes to one file produces a single batch.
+    """
+    backend = open_backend(directory, poll_interval)
+    try:
+        while True:
+            names = {n for n in backend.poll(60.0) if _DIGEST_NAME.match(n)}
+            if not names:
+                continue
+            first = time.monotonic()
+            while time.monotonic() - first < max_wait:
+                more = {n for n in backend.poll(debounce) if _DIGEST_NAME.match(n)}
+                if not more:
+                    break
+                names |= more
+            paths = [os.path.join(directory, n) for n in sorted(names)]
+            yield [p for p in paths if os.path.exists(p)]
+    finally:
+        backend.close()
@@ -0,0 +1,64 @@
+"""
+LTTB Downsampling
+Largest-Triangle-Three-Buckets (Steinarsson, 2013): reduces a time series
+to a fixed number of points while keeping its visual shape — peaks,
+troughs and turning points survive, flat stretches are thinned out.
+
+The first and last points are always kept. The points in between are split
+into equal buckets, and from each bucket the point forming the largest
+triangle with the previously kept point and the average of the next bucket
+is kept.
+"""
+
+import datetime
+
+_EPOCH = datetime.datetime(1970, 1, 1)
+
+
+def _as_number(x):
+    if isinstance(x, datetime.datetime):
+        return (x.replace(tzinfo=None) - _EPOCH).total_seconds()
+    if isinstance(x, datetime.date):
+        return (x - _EPOCH.date()).days * 86400.0
+    return float(x)
+
+
+def lttb_indices(xs, ys, threshold):
+    """Indices (ascending) of the `threshold` points LTTB keeps from numeric xs / ys."""
+    n = len(xs)
+    if threshold >= n or threshold < 3:
+        return list(range(n))
+
+    every = (n - 2) / (threshold - 2)
+    kept  = [0]
+    a     = 0
+    for i in range(threshold - 2):
+        # Average of the next bucket (just the last point for the final bucket)
+        nxt_start = int((i + 1) * every) + 1
+        nxt_end   = min(int((i + 2) * every) + 1, n)
+        span  = nxt_end - nxt_start
+        avg_x = sum(xs[nxt_start:nxt_end]) / span
+        avg_y = sum(ys[nxt_start:nxt_end]) / span
+
+        ax, ay = xs[a], ys[a]
+        best, best_area = -1, -1.0
+        for j in range(int(i * every) + 1, nxt_start):
+            area = abs((ax - avg_x) * (ys[j] - ay) - (ax - xs[j]) * (avg_y - ay))
+            if area > best_area:
+                best, best_area = j, area
+        kept.append(best)
+        a = best
+    kept.append(n - 1)
+    return kept
+
+
+def downsample(points, budget):
+    """
+    [(x, y)] → at most `budget` of those points, in order. x may be a date,
+    datetime or number; series already within budget are returned as-is.
+    """
+    if len(points) <= budget:
+        return list(points)
+    xs = [_as_number(x) for x, _ in points]
+    ys = [float(y) for _, y in points]
+    return [points[i] for i in lttb_indices(xs, ys, budget)]
@@ -0,0 +1,243 @@
+"""
+Market Data Client
+Shared HTTP client for the price APIs the bitcoin scripts call.
+
+  - one pooled requests.Session per process, so repeated calls reuse
+    keep-alive connections
+  - bounded exponential backoff with full jitter on connection errors,
+    timeouts and 429/5xx responses; a 429's Retry-After header is honoured
+  - conditional requests: the ETag / Last-Modified of each response is kept
+    on disk next to its body, and a 304 Not Modified is answered from there
+  - thread-safe, with at most HOST_CONCURRENCY requests in flight per host,
+    so callers can fan out over a thread pool without tripping rate limits
+  - every request takes a token from its endpoint family's bucket in
+    rate_limit.py, so separate processes share one quota
+
+Environment:
+  COINGECKO_API_BASE    point at another server, e.g. the local stand-in
+                        (scripts/coingecko_standin.py) for load tests
+  MARKET_DATA_MODE      live (default) | record | replay — record saves every
+                        response as a JSON fixture; replay serves only
+                        fixtures and never touches the network
+  MARKET_DATA_FIXTURES  fixture directory for record / replay
+"""
+
+import os
+import json
+import time
+import random
+import hashlib
+import threading
+import urllib.parse
+
+import rate_limit
+
+try:
+    import requests
+    from requests.adapters import HTTPAdapter
+    _HAS_REQUESTS = True
+except ImportError:
+    _HAS_REQUESTS = False
+
+COINGECKO_API    = os.environ.get("COINGECKO_API_BASE", "https://api.coingecko.com/api/v3").rstrip("/")
+CACHE_DIRNAME    = ".market-data-cache"
+MODE             = os.environ.get("MARKET_DATA_MODE", "live").lower()
+FIXTURES_DIR     = os.environ.get("MARKET_DATA_FIXTURES",
+                                  os.path.expanduser("~/.cache/claude_code_jshao/market-data-fixtures"))
+
+TIMEOUT          = (5, 15)      # connect, read (seconds)
+MAX_RETRIES      = 4
+BACKOFF_BASE     = 1.0          # seconds; doubles per attempt
+BACKOFF_CAP      = 30.0
+RETRY_AFTER_CAP  = 120.0        # never sleep longer than this for one Retry-After
+RETRY_STATUSES   = {429, 500, 502, 503, 504}
+HOST_CONCURRENCY = 4
+
+_session      = None
+_session_lock = threading.Lock()
+_host_slots   = {}
+
+
+# ── 1. Session ────────────────────────────────────────────────────────────────
+
+def session():
+    """The process-wide pooled Session (created on first use)."""
+    global _session
+    with _session_lock:
+        if _session is None:
+            if not _HAS_REQUESTS:
+                raise RuntimeError("requests not installed")
+            s = requests.Session()
+            adapter = HTTPAdapter(pool_connections=4, pool_maxsize=HOST_CONCURRENCY * 2)
+            s.mount("https://", adapter)
+            s.mount("http://", adapter)
+            s.headers.update({"Accept": "application/json",
+                              "User-Agent": "claude_code_jshao-bitcoin/1.0"})
+            _session = s
+        return _session
+
+
+def _host_slot(url):
+    """Semaphore limiting concurrent requests to the host of `url`."""
+    host = urllib.parse.urlsplit(url).netloc
+    with _session_lock:
+        if host not in _host_slots:
+            _host_slots[host] = threading.BoundedSemaphore(HOST_CONCURRENCY)
+        return _host_slots[host]
+
+
+# ── 2. Backoff ────────────────────────────────────────────────────────────────
+
+def _retry_after(resp):
+    """Seconds requested by a Retry-After header, or None."""
+    return rate_limit.parse_retry_after(resp.headers.get("Retry-After"))
+
+
+def backoff_delay(attempt, retry_after=None):
+    """Sleep before retry `attempt` (0-based): Retry-After if given, else full jitter."""
+    if retry_after is not None:
+        return min(retry_after, RETRY_AFTER_CAP)
+    return random.uniform(0, min(BACKOFF_CAP, BACKOFF_BASE * 2 ** attempt))
+
+
+# ── 3. Validator cache ────────────────────────────────────────────────────────
+
+def _cache_file(cache_dir, url, params):
+    key = url + "?" + "&".join(f"{k}={v}" for k, v in sorted((params or {}).items()))
+    return os.path.join(cache_dir, hashlib.sha1(key.encode()).hexdigest() + ".json")
+
+
+def _load_cached(path):
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def _save_cached(path, resp, body):
+    validators = {"etag": resp.headers.get("ETag"),
+                  "last_modified": resp.headers.get("Last-Modified")}
+    if not any(validators.values()):
+        return
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = path + ".tmp"
+    try:
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({**validators, "body": body}, f, separators=(",", ":"))
+        os.replace(tmp, path)
+    except OSError as e:
+        print(f"   ⚠️  Could not write market-data cache — {e}")
+
+
+# ── 4. Record / replay ────────────────────────────────────────────────────────
+
+class FixtureMissing(LookupError):
+    """Replay mode was asked for a request that was never recorded."""
+
+
+def fixture_path(url, params, fixtures_dir=None):
+    """
+    Fixture file for a request. Only the URL path and query are keyed, not
+    the host, so fixtures recorded against CoinGecko replay under any base.
+    """
+    path = urllib.parse.urlsplit(url).path
+    key  = path + "?" + "&".join(f"{k}={v}" for k, v in sorted((params or {}).items()))
+    slug = "_".join(p for p in path.split("/")[-3:] if p)
+    return os.path.join(fixtures_dir or FIXTURES_DIR,
+                        f"{slug}-{hashlib.sha1(key.encode()).hexdigest()[:16]}.json")
+
+
+def _record(url, params, body):
+    path = fixture_path(url, params)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump({"path": urllib.parse.urlsplit(url).path, "params": params or {},
+                   "body": body}, f, separators=(",", ":"))
+    os.replace(tmp, path)
+
+
+def _replay(url, params):
+    path = fixture_path(url, params)
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)["body"]
+    except (OSError, ValueError, KeyError):
+        raise FixtureMissing(f"no fixture for {urllib.parse.urlsplit(url).path} {params or {}} "
+                             f"(expected {path})") from None
+
+
+# ── 5. Requests ───────────────────────────────────────────────────────────────
+
+def get_json(url, params=None, cache_dir=None, retries=MAX_RETRIES, family=None):
+    """
+    GET `url` and return the decoded JSON body.
+
+    Transient failures are retried up to `retries` times with backoff; the
+    last error is raised. With `cache_dir`, the request is made conditional
+    on the previous response's validators and a 304 returns the stored body.
+    MARKET_DATA_MODE=replay answers from fixtures only; =record saves one.
+    With `family`, each attempt first takes a rate_limit token, and a 429
+    pauses the family for every process instead of sleeping here.
+    """
+    if MODE == "replay":
+        return _replay(url, params)
+
+    cache_path = _cache_file(cache_dir, url, params) if cache_dir else None
+    cached     = _load_cached(cache_path) if cache_path else None
+    headers    = {}
+    if cached:
+        if cached.get("etag"):
+            headers["If-None-Match"] = cached["etag"]
+        if cached.get("last_modified"):
+            headers["If-Modified-Since"] = cached["last_modified"]
+
+    http = session()
+    for attempt in range(retries + 1):
+        if family:
+            rate_limit.acquire(family)
+        try:
+            with _host_slot(url):
+                resp = http.get(url, params=params, headers=headers, timeout=TIMEOUT)
+        except (requests.ConnectionError, requests.Timeout):
+            if attempt == retries:
+                raise
+            time.sleep(backoff_delay(attempt))
+            continue
+
+        if resp.status_code == 304 and cached:
+            body = cached["body"]
+            if MODE == "record":
+                _record(url, params, body)
+            return body
+        if resp.status_code in RETRY_STATUSES and attempt < retries:
+            delay = backoff_delay(attempt, _retry_after(resp))
+            print(f"   ⏳ {resp.status_code} from {resp.url.split('?')[0]} — retrying in {delay:.1f}s")
+            if family and resp.status_code == 429:
+                rate_limit.penalize(family, delay)
+            else:
+                time.sleep(delay)
+            continue
+        resp.raise_for_status()
+        body = resp.json()
+        if cache_path:
+            _save_cached(cache_path, resp, body)
+        if MODE == "record":
+            _record(url, params, body)
+        return body
+
+
+def coingecko_market_chart(asset="bitcoin", currency="usd", days=90, cache_dir=None,
+                           interval="daily"):
+    """
+    Raw [[ts_ms, price], ...] from CoinGecko's /market_chart. With
+    interval=None CoinGecko picks the granularity: 5-minutely for 1 day,
+    hourly for 2–90 days.
+    """
+    params = {"vs_currency": currency, "days": days}
+    if interval:
+        params["interval"] = interval
+    body = get_json(f"{COINGECKO_API}/coins/{asset}/market_chart", params,
+                    cache_dir=cache_dir, family="coingecko")
+    return body.get("prices", [])
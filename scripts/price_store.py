@@ -0,0 +1,350 @@
+"""
+Price History Store
+Local SQLite time series of daily prices, shared by bitcoin_chart.py and
+bitcoin_weekly_slides.py, plus the last few days of hourly prices for the
+chart's short views.
+
+Each run asks CoinGecko only for the days after the last stored date (plus
+that last day again, since today's point is provisional until the day
+closes) and then serves every window from disk. If the store was synced
+recently no request is made at all, and if the network is down the stored
+history is served as-is, so the charts still render offline.
+"""
+
+import os
+import math
+import time
+import sqlite3
+import datetime
+from concurrent.futures import ThreadPoolExecutor
+
+import market_data
+import rate_limit
+
+DB_NAME = ".price-history.sqlite"
+
+# A store synced less than this many seconds ago is served without a request
+SYNC_MAX_AGE = 15 * 60
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS prices (
+    asset    TEXT NOT NULL,
+    currency TEXT NOT NULL,
+    date     TEXT NOT NULL,
+    price    REAL NOT NULL,
+    PRIMARY KEY (asset, currency, date)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS sync (
+    asset        TEXT NOT NULL,
+    currency     TEXT NOT NULL,
+    covered_from TEXT NOT NULL,
+    synced_at    REAL NOT NULL,
+    PRIMARY KEY (asset, currency)
+);
+CREATE TABLE IF NOT EXISTS intraday (
+    asset    TEXT NOT NULL,
+    currency TEXT NOT NULL,
+    ts       INTEGER NOT NULL,
+    price    REAL NOT NULL,
+    PRIMARY KEY (asset, currency, ts)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS intraday_sync (
+    asset     TEXT NOT NULL,
+    currency  TEXT NOT NULL,
+    synced_at REAL NOT NULL,
+    PRIMARY KEY (asset, currency)
+);
+"""
+
+
+# ── 1. CoinGecko ──────────────────────────────────────────────────────────────
+
+def fetch_daily(asset="bitcoin", currency="usd", days=90, cache_dir=None):
+    """
+    Download `days` days of daily prices as [(date, price)] through the shared
+    market_data client (which retries transient errors). Raises once retries
+    are exhausted. CoinGecko appends the live price as an extra point dated
+    today; it comes last, so it wins when the rows are upserted.
+    """
+    return [
+        (datetime.datetime.fromtimestamp(ts_ms / 1000, datetime.timezone.utc).date(), price)
+        for ts_ms, price in market_data.coingecko_market_chart(asset, currency, days, cache_dir)
+    ]
+
+
+def fetch_intraday(asset="bitcoin", currency="usd", days=7, cache_dir=None):
+    """
+    Download `days` days at CoinGecko's automatic granularity (5-minute for
+    one day, hourly up to 90) as [(unix_seconds, price)].
+    """
+    return [
+        (int(ts_ms // 1000), price)
+        for ts_ms, price in market_data.coingecko_market_chart(asset, currency, days, cache_dir,
+                                                               interval=None)
+    ]
+
+
+# ── 2. Store ──────────────────────────────────────────────────────────────────
+
+class PriceStore:
+    """Daily (asset, currency, date) → price rows in one SQLite file."""
+
+    def __init__(self, directory, asset="bitcoin", currency="usd", db=None):
+        """`db` reuses another store's connection (it stays owned by that store)."""
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        self.path      = os.path.join(directory, DB_NAME)
+        self.asset     = asset
+        self.currency  = currency
+        self._owns_db  = db is None
+        if db is None:
+            db = sqlite3.connect(self.path, timeout=30)
+            db.executescript(_SCHEMA)
+        self._db = db
+
+    def close(self):
+        if self._owns_db:
+            self._db.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    # ── Reading ───────────────────────────────────────────────────────────
+
+    def bounds(self):
+        """(first_date, last_date) stored for this series, or (None, None)."""
+        first, last = self._db.execute(
+            "SELECT MIN(date), MAX(date) FROM prices WHERE asset = ? AND currency = ?",
+            (self.asset, self.currency)).fetchone()
+        if first is None:
+            return None, None
+        return datetime.date.fromisoformat(first), datetime.date.fromisoformat(last)
+
+    def window(self, days, end=None):
+        """[(date, price)] for the `days` days up to `end` (default: today, UTC), oldest first."""
+        end   = end or _utc_today()
+        start = end - datetime.timedelta(days=days)
+        rows = self._db.execute(
+            "SELECT date, price FROM prices WHERE asset = ? AND currency = ? "
+            "AND date >= ? AND date <= ? ORDER BY date",
+            (self.asset, self.currency, start.isoformat(), end.isoformat()))
+        return [(datetime.date.fromisoformat(d), p) for d, p in rows]
+
+    def intraday_window(self, days, end=None):
+        """[(naive UTC datetime, price)] for the last `days` days before `end` (default: now)."""
+        end   = end or time.time()
+        start = end - days * 86400
+        rows = self._db.execute(
+            "SELECT ts, price FROM intraday WHERE asset = ? AND currency = ? "
+            "AND ts >= ? AND ts <= ? ORDER BY ts",
+            (self.asset, self.currency, int(start), int(end)))
+        return [(_utc_datetime(ts), p) for ts, p in rows]
+
+    def _sync_state(self):
+        row = self._db.execute(
+            "SELECT covered_from, synced_at FROM sync WHERE asset = ? AND currency = ?",
+            (self.asset, self.currency)).fetchone()
+        if row is None:
+            return None, 0.0
+        return datetime.date.fromisoformat(row[0]), row[1]
+
+    # ── Writing ───────────────────────────────────────────────────────────
+
+    def upsert(self, rows, covered_from=None):
+        """Insert or overwrite (date, price) rows; later rows for a date win."""
+        with self._db:
+            self._db.executemany(
+                "INSERT OR REPLACE INTO prices (asset, currency, date, price) VALUES (?, ?, ?, ?)",
+                [(self.asset, self.currency, d.isoformat(), float(p)) for d, p in rows])
+            if covered_from is not None:
+                prev, _ = self._sync_state()
+                covered_from = min(covered_from, prev or covered_from)
+                self._db.execute(
+                    "INSERT OR REPLACE INTO sync (asset, currency, covered_from, synced_at) "
+                    "VALUES (?, ?, ?, ?)",
+                    (self.asset, self.currency, covered_from.isoformat(), time.time()))
+
+    def sync_plan(self, days, max_age=SYNC_MAX_AGE):
+        """
+        (fetch_days, covered_from) for the request sync() would make, or None
+        if the store was synced within `max_age` seconds and needs nothing.
+        """
+        today = _utc_today()
+        start = today - datetime.timedelta(days=days)
+        covered_from, synced_at = self._sync_state()
+        _, last = self.bounds()
+
+        if covered_from is None or covered_from > start or last is None:
+            return days, start
+        if time.time() - synced_at < max_age:
+            return None
+        return max(1, (today - last).days + 1), covered_from
+
+    def fetch(self, fetch_days):
+        """
+        fetch_daily() for this series, or None (with a warning) if it failed.
+        Touches no database state, so it is safe to run on a worker thread.
+        """
+        try:
+            return fetch_daily(self.asset, self.currency, fetch_days,
+                               cache_dir=os.path.join(self.directory, market_data.CACHE_DIRNAME))
+        except Exception as e:
+            print(f"   ⚠️  CoinGecko fetch failed — {e}")
+            return None
+
+    def sync(self, days, max_age=SYNC_MAX_AGE):
+        """
+        Make sure the last `days` days are on disk, fetching as little as
+        possible: nothing if the store was synced within `max_age` seconds,
+        the whole window if it does not reach back far enough yet, otherwise
+        only the days since the last stored date. Returns rows received,
+        or None if the fetch failed (the stored history is left untouched).
+        """
+        plan = self.sync_plan(days, max_age)
+        if plan is None:
+            return 0
+        fetch_days, covered_from = plan
+        rows = self.fetch(fetch_days)
+        if rows is None:
+            return None
+        self.upsert(rows, covered_from=covered_from)
+        return len(rows)
+
+    def sync_intraday(self, days=7, max_age=SYNC_MAX_AGE):
+        """
+        Like sync(), for intraday points: the full `days` on first use (or
+        after a long gap), otherwise only the whole days since the last
+        stored point. Returns rows received, or None if the fetch failed.
+        """
+        now = time.time()
+        last, = self._db.execute(
+            "SELECT MAX(ts) FROM intraday WHERE asset = ? AND currency = ?",
+            (self.asset, self.currency)).fetchone()
+        row = self._db.execute(
+            "SELECT synced_at FROM intraday_sync WHERE asset = ? AND currency = ?",
+            (self.asset, self.currency)).fetchone()
+        if last is not None and row and now - row[0] < max_age:
+            return 0
+        if last is None or now - last > days * 86400:
+            fetch_days = days
+        else:
+            fetch_days = max(1, math.ceil((now - last) / 86400))
+
+        try:
+            rows = fetch_intraday(self.asset, self.currency, fetch_days,
+                                  cache_dir=os.path.join(self.directory, market_data.CACHE_DIRNAME))
+        except Exception as e:
+            print(f"   ⚠️  CoinGecko intraday fetch failed — {e}")
+            return None
+        with self._db:
+            self._db.executemany(
+                "INSERT OR REPLACE INTO intraday (asset, currency, ts, price) VALUES (?, ?, ?, ?)",
+                [(self.asset, self.currency, ts, float(p)) for ts, p in _hourly(rows)])
+            self._db.execute(
+                "DELETE FROM intraday WHERE asset = ? AND currency = ? AND ts < ?",
+                (self.asset, self.currency, int(now - days * 86400)))
+            self._db.execute(
+                "INSERT OR REPLACE INTO intraday_sync (asset, currency, synced_at) VALUES (?, ?, ?)",
+                (self.asset, self.currency, now))
+        return len(rows)
+
+
+def _hourly(rows):
+    """
+    [(ts, price)] resampled to one point per hour, stamped at the start of
+    the hour with the last price seen in it. A days=1 fetch comes back at
+    5-minute steps and longer ones hourly; snapping both to the hour keeps
+    the stored series at one granularity.
+    """
+    buckets = {}
+    for ts, price in sorted(rows):
+        buckets[ts - ts % 3600] = price
+    return sorted(buckets.items())
+
+
+def _utc_datetime(ts):
+    return datetime.datetime.fromtimestamp(ts, datetime.timezone.utc).replace(tzinfo=None)
+
+
+def _utc_today():
+    return datetime.datetime.now(datetime.timezone.utc).date()
+
+
+# ── 3. Convenience ────────────────────────────────────────────────────────────
+
+def daily_prices(directory, days, asset="bitcoin", currency="usd"):
+    """Sync the store in `directory` incrementally and return the last `days` days."""
+    with PriceStore(directory, asset, currency) as store:
+        received = store.sync(days)
+        prices = store.window(days)
+    if received is None and prices:
+        print(f"   Serving {len(prices)} stored day(s) (through {prices[-1][0]}) offline.")
+    return prices
+
+
+def history(directory, sync_days, asset="bitcoin", currency="usd"):
+    """
+    Sync the last `sync_days` days incrementally and return every day the
+    store holds, oldest first — the store keeps days the API no longer serves.
+    """
+    with PriceStore(directory, asset, currency) as store:
+        received = store.sync(sync_days)
+        first, _ = store.bounds()
+        prices = store.window((_utc_today() - first).days) if first else []
+    if received is None and prices:
+        print(f"   Serving {len(prices)} stored day(s) (through {prices[-1][0]}) offline.")
+    return prices
+
+
+def intraday_prices(directory, days=7, asset="bitcoin", currency="usd"):
+    """Sync intraday points incrementally and return the last `days` days of them."""
+    with PriceStore(directory, asset, currency) as store:
+        store.sync_intraday(days)
+        return store.intraday_window(days)
+
+
+def fetch_many(directory, assets, currencies, days):
+    """
+    Sync every (asset, currency) pair at once and return the series aligned
+    on the dates they all share:
+
+        (dates, {(asset, currency): [price, ...]})
+
+    Only the downloads run in parallel. Every read and write goes through
+    one SQLite connection on the calling thread, so the pairs never contend
+    for the database lock. The pool is no wider than the coingecko rate
+    limiter's burst, because any extra threads would only queue for a token.
+
+    Pairs with no history at all (never fetched and offline) are left out.
+    """
+    pairs = [(a, c) for a in assets for c in currencies]
+    if not pairs:
+        return [], {}
+    with PriceStore(directory, *pairs[0]) as first:
+        stores = [first] + [PriceStore(directory, a, c, db=first._db) for a, c in pairs[1:]]
+        plans  = [(store, store.sync_plan(days)) for store in stores]
+        todo   = [(store, plan) for store, plan in plans if plan]
+        if todo:
+            _, burst = rate_limit.limits("coingecko")
+            with ThreadPoolExecutor(max_workers=min(len(todo), int(burst))) as pool:
+                fetched = list(pool.map(lambda item: item[0].fetch(item[1][0]), todo))
+            for (store, (_, covered_from)), rows in zip(todo, fetched):
+                if rows is not None:
+                    store.upsert(rows, covered_from=covered_from)
+        windows = [store.window(days) for store in stores]
+    return align(dict(zip(pairs, windows)))
+
+
+def align(windows):
+    """
+    {pair: [(date, price)]} → (dates, {pair: [price, ...]}) on the dates
+    every series has; empty series are dropped.
+    """
+    series = {pair: dict(w) for pair, w in windows.items() if w}
+    if not series:
+        return [], {}
+    dates = sorted(set.intersection(*(set(s) for s in series.values())))
+    return dates, {pair: [s[d] for d in dates] for pair, s in series.items()}
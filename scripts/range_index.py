@@ -0,0 +1,73 @@
+"""
+Range Index
+Sparse tables over a price series, answering "highest / lowest price (and
+when) between two dates" in O(1) after O(n log n) setup — so the chart's
+preset-window buttons and the weekly slides' range stats can ask for as
+many windows as they like without rescanning the series.
+
+Level k of each table holds, for every start i, the index of the extreme
+in [i, i + 2^k). Any window [i, j] is covered by two overlapping blocks of
+the largest such size, and the answer is the better of the two. Ties go to
+the earlier point, like list.index(max(...)).
+"""
+
+import bisect
+
+
+class RangeIndex:
+    """
+    High/low queries over [(x, price)] sorted by x. x can be anything
+    ordered — dates, datetimes, ISO strings — as long as queries use the
+    same type.
+    """
+
+    def __init__(self, points):
+        self.xs = [x for x, _ in points]
+        self.ys = [float(y) for _, y in points]
+        self._hi = self._build(self._higher)
+        self._lo = self._build(self._lower)
+
+    def __len__(self):
+        return len(self.xs)
+
+    def _higher(self, a, b):
+        return a if self.ys[a] >= self.ys[b] else b
+
+    def _lower(self, a, b):
+        return a if self.ys[a] <= self.ys[b] else b
+
+    def _build(self, pick):
+        n = len(self.ys)
+        table = [list(range(n))]
+        k = 1
+        while (1 << k) <= n:
+            prev, half = table[-1], 1 << (k - 1)
+            table.append([pick(prev[i], prev[i + half]) for i in range(n - (1 << k) + 1)])
+            k += 1
+        return table
+
+    def _query(self, table, pick, i, j):
+        k = (j - i + 1).bit_length() - 1
+        return pick(table[k][i], table[k][j - (1 << k) + 1])
+
+    def span(self, start=None, end=None):
+        """(i, j) — inclusive indices of the points with start <= x <= end — or None if empty."""
+        i = 0 if start is None else bisect.bisect_left(self.xs, start)
+        j = len(self.xs) - 1 if end is None else bisect.bisect_right(self.xs, end) - 1
+        return (i, j) if i <= j else None
+
+    def high(self, start=None, end=None):
+        """(x, price) of the highest price in [start, end], or None if no point falls inside."""
+        span = self.span(start, end)
+        if span is None:
+            return None
+        i = self._query(self._hi, self._higher, *span)
+        return self.xs[i], self.ys[i]
+
+    def low(self, start=None, end=None):
+        """(x, price) of the lowest price in [start, end], or None if no point falls inside."""
+        span = self.span(start, end)
+        if span is None:
+            return None
+        i = self._query(self._lo, self._lower, *span)
+        return self.xs[i], self.ys[i]
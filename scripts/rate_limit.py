@@ -0,0 +1,156 @@
+"""
+Rate Limiter
+Token buckets for outbound API calls, one per endpoint family, shared by
+every process on the machine.
+
+Bucket state lives in a small JSON file guarded by an fcntl lock, so a
+cron run, a --watch loop and a manual run draw from the same quota and
+space their calls out instead of bursting into 429s. When a server does
+answer 429, penalize() pauses the whole family for its Retry-After, for
+every process at once.
+
+Limits are requests per minute plus a burst size. Override one with
+RATE_LIMIT_<FAMILY>=<per_minute>[:<burst>], e.g. RATE_LIMIT_COINGECKO=10:2;
+a rate of 0 disables limiting for that family (useful against the local
+stand-in). RATE_LIMIT_STATE moves the state file.
+"""
+
+import os
+import json
+import time
+import datetime
+import threading
+import email.utils
+
+try:
+    import fcntl
+    _HAS_FCNTL = True
+except ImportError:
+    _HAS_FCNTL = False
+
+STATE_FILE = os.environ.get("RATE_LIMIT_STATE",
+                            os.path.expanduser("~/.cache/claude_code_jshao/rate-limits.json"))
+
+# family → (requests per minute, burst)
+DEFAULT_LIMITS = {
+    "coingecko": (25, 5),     # free tier allows ~30/min
+    "anthropic": (40, 4),
+}
+
+_local_lock = threading.Lock()
+
+
+# ── 1. Limits ─────────────────────────────────────────────────────────────────
+
+def limits(family):
+    """(tokens per second, bucket capacity) for `family`; rate 0 means unlimited."""
+    per_minute, burst = DEFAULT_LIMITS.get(family, (60, 10))
+    override = os.environ.get(f"RATE_LIMIT_{family.upper()}")
+    if override:
+        rate, _, cap = override.partition(":")
+        try:
+            per_minute = float(rate)
+            burst = float(cap) if cap else burst
+        except ValueError:
+            print(f"   ⚠️  Ignoring malformed RATE_LIMIT_{family.upper()}={override!r}")
+    return per_minute / 60.0, max(1.0, float(burst))
+
+
+def parse_retry_after(value):
+    """Seconds from a Retry-After header value (delta-seconds or HTTP date), or None."""
+    if not value:
+        return None
+    value = value.strip()
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        when = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, (when - datetime.datetime.now(datetime.timezone.utc)).total_seconds())
+
+
+# ── 2. Shared state ───────────────────────────────────────────────────────────
+
+class _LockedState:
+    """Context manager: exclusive lock on the state file, yielding its dict."""
+
+    def __enter__(self):
+        _local_lock.acquire()
+        try:
+            os.makedirs(os.path.dirname(STATE_FILE), exist_ok=True)
+            self._fh = open(STATE_FILE + ".lock", "a+")
+            if _HAS_FCNTL:
+                fcntl.flock(self._fh, fcntl.LOCK_EX)
+            try:
+                with open(STATE_FILE, "r", encoding="utf-8") as f:
+                    self.state = json.load(f)
+            except (OSError, ValueError):
+                self.state = {}
+        except OSError:
+            _local_lock.release()
+            raise
+        return self.state
+
+    def __exit__(self, *exc):
+        try:
+            tmp = STATE_FILE + ".tmp"
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(self.state, f)
+            os.replace(tmp, STATE_FILE)
+        finally:
+            if _HAS_FCNTL:
+                fcntl.flock(self._fh, fcntl.LOCK_UN)
+            self._fh.close()
+            _local_lock.release()
+
+
+def _refill(bucket, rate, capacity, now):
+    bucket["tokens"] = min(capacity, bucket["tokens"] + (now - bucket["updated"]) * rate)
+    bucket["updated"] = now
+
+
+# ── 3. API ────────────────────────────────────────────────────────────────────
+
+def acquire(family, tokens=1):
+    """
+    Block until `tokens` can be taken from `family`'s bucket, then take them.
+    Returns the seconds spent waiting. Families over their rate wait their
+    turn; families paused by penalize() wait out the pause.
+    """
+    rate, capacity = limits(family)
+    if rate <= 0:
+        return 0.0
+    tokens = min(tokens, capacity)
+    waited = 0.0
+    while True:
+        with _LockedState() as state:
+            now    = time.time()
+            bucket = state.setdefault(family, {"tokens": capacity, "updated": now, "paused_until": 0})
+            _refill(bucket, rate, capacity, now)
+            if now < bucket.get("paused_until", 0):
+                wait = bucket["paused_until"] - now
+            elif bucket["tokens"] >= tokens:
+                bucket["tokens"] -= tokens
+                return waited
+            else:
+                wait = (tokens - bucket["tokens"]) / rate
+        time.sleep(wait)
+        waited += wait
+
+
+def penalize(family, retry_after=None):
+    """
+    Record a 429 for `family`: empty its bucket and, given a Retry-After,
+    pause it for that many seconds in every process.
+    """
+    with _LockedState() as state:
+        now    = time.time()
+        rate, capacity = limits(family)
+        bucket = state.setdefault(family, {"tokens": capacity, "updated": now, "paused_until": 0})
+        _refill(bucket, rate, capacity, now)
+        bucket["tokens"] = 0
+        if retry_after:
+            bucket["paused_until"] = max(bucket.get("paused_until", 0), now + retry_after)